@@ -1,12 +1,106 @@
 import numpy as np
 
 
+class AgentTrace:
+    """
+    Bounded record of the states visited by the agent, backed by a preallocated
+    int32 ring buffer. Only the last `capacity` entries are kept, so long rollouts
+    run in constant memory. capacity=0 disables recording.
+    None entries (stored as -1) mark the start of an episode.
+    Indexing works like a list over the kept entries, e.g. trace[-2].
+    """
+
+    __slots__ = ('capacity', 'buffer', 'head', 'size')
+
+    def __init__(self, capacity=1024):
+        """
+        Args:
+            capacity (int): Maximum number of entries kept (0 disables the trace)
+        """
+        self.capacity = capacity
+        self.buffer = np.full(capacity, -1, dtype=np.int32)
+        # Next write position and number of kept entries
+        self.head = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("agent trace index out of range")
+        state = self.buffer[(self.head - self.size + index) % self.capacity]
+        return None if state < 0 else int(state)
+
+    def append(self, state):
+        """
+        Record one state (or None as an episode marker).
+        """
+        if self.capacity == 0:
+            return
+        self.buffer[self.head] = -1 if state is None else state
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def clear(self):
+        self.head = 0
+        self.size = 0
+
+    def to_array(self) -> np.ndarray:
+        """
+        Export the kept entries, oldest first.
+
+        Returns:
+            np.ndarray: int32 states, -1 for episode markers
+        """
+        start = (self.head - self.size) % self.capacity if self.capacity else 0
+        if start + self.size <= self.capacity:
+            return self.buffer[start:start + self.size].copy()
+        return np.concatenate([self.buffer[start:], self.buffer[:self.head]])
+
+    def visit_counts(self, n_states) -> np.ndarray:
+        """
+        Number of visits of every state among the kept entries (for heatmaps).
+
+        Args:
+            n_states (int): Number of states
+
+        Returns:
+            np.ndarray: Counts, shape (n_states,)
+        """
+        states = self.to_array()
+        return np.bincount(states[states >= 0], minlength=n_states)
+
+
 class GridWorld:
-    def __init__(self, size=7, seed=42):
+    # Arrays that make up the transition model, see build_transition_model
+    TRANSITION_ARRAYS = ('next_states', 'successors', 'successor_probs')
+
+    __slots__ = ('rng', 'size', 'n_states', 'compact', 'initial_state', 'agent_state', 'agent_trace',
+                 'terminal_states', 'walls', 'penalty_states', 'actions', 'action_symbols',
+                 'terminal_mask', 'wall_mask', 'rewards', 'main_transition_prob',
+                 'transition_probs', '_predecessors') + TRANSITION_ARRAYS
+
+    def __init__(self, size=7, seed=42, dense_transitions=False, transition_arrays=None, compact=False,
+                 trace_capacity=1024):
+        """
+        Args:
+            size (int): Width and height of the grid
+            seed (int): Random seed for the agent's stochastic movements
+            dense_transitions (bool): Also build the dense transition_probs tensor
+            transition_arrays (dict): Prebuilt TRANSITION_ARRAYS (e.g. views into shared
+                memory) to use instead of building the transition model
+            compact (bool): Store the transition model as int32 indices and float32
+                probabilities/rewards instead of int64/float64
+            trace_capacity (int): Number of visited states kept in agent_trace (0 disables it)
+        """
         # Set random seed
         self.rng = np.random.RandomState(seed)
 
         self.size = size
+        self.compact = compact
 
         # Define states
         self.n_states = size * size
@@ -23,7 +117,9 @@ class GridWorld:
         # initial state
         self.initial_state = self.index_to_state(0, 0)
         self.agent_state = self.initial_state
-        self.agent_trace = [None, self.agent_state] # comment
+        self.agent_trace = AgentTrace(trace_capacity)
+        self.agent_trace.append(None)
+        self.agent_trace.append(self.agent_state)
 
         # terminal states
         self.terminal_states = {
@@ -48,22 +144,130 @@ class GridWorld:
         self.actions = [0, 1, 2, 3]
         self.action_symbols = ['↑', '→', '↓', '←']
 
+        # Boolean masks over states, used by the vectorized backups
+        self.terminal_mask = np.zeros(self.n_states, dtype=bool)
+        self.terminal_mask[list(self.terminal_states)] = True
+        self.wall_mask = np.zeros(self.n_states, dtype=bool)
+        self.wall_mask[list(self.walls)] = True
+
         # Define rewards
-        self.rewards = np.zeros(self.n_states)
+        self.rewards = np.zeros(self.n_states, dtype=np.float32 if compact else np.float64)
         self.rewards[[ts for ts in self.terminal_states]] = 1.0
         self.rewards[[ps for ps in self.penalty_states]] = -1.0
 
         # Transition probability
         self.main_transition_prob = 0.8
-        self.transition_probs = np.zeros((self.n_states, len(self.actions), self.n_states))
-        # Calculate transition probabilities
-        for s in range(self.n_states):
-            for a in self.actions:
-                for s_prime in self.get_possible_successors(s, a):
-                    if s_prime == self.transition(s, a):  # Main movement
-                        self.transition_probs[s, a, s_prime] = self.main_transition_prob
-                    else:  # Perpendicular movements
-                        self.transition_probs[s, a, s_prime] = (1 - self.main_transition_prob) / 2
+
+        if transition_arrays is not None:
+            for name in self.TRANSITION_ARRAYS:
+                setattr(self, name, transition_arrays[name])
+        else:
+            # Deterministic next state for every (s, a) pair, shape (n_states, n_actions)
+            self.next_states = self.compute_next_states()
+            self.build_transition_model()
+
+        # Predecessor index, built by predecessors() on first use
+        self._predecessors = None
+
+        # Dense (n_states, n_actions, n_states) tensor, only built on request
+        self.transition_probs = self.dense_transition_probs() if dense_transitions else None
+
+    def compute_next_states(self) -> np.ndarray:
+        """
+        Compute the next state of every (s, a) pair with array ops over coordinates.
+        Moves into a wall or off the grid leave the agent in place.
+        """
+        states = np.arange(self.n_states)
+        i, j = np.divmod(states, self.size)
+
+        # Row/column offsets for up (0), right (1), down (2), left (3)
+        di = np.array([-1, 0, 1, 0])
+        dj = np.array([0, 1, 0, -1])
+        next_i = i[:, None] + di
+        next_j = j[:, None] + dj
+
+        inside = (next_i >= 0) & (next_i < self.size) & (next_j >= 0) & (next_j < self.size)
+        candidates = np.where(inside, next_i * self.size + next_j, 0)
+        blocked = ~inside | self.wall_mask[candidates]
+        next_states = np.where(blocked, states[:, None], candidates)
+        return next_states.astype(np.int32) if self.compact else next_states
+
+    def build_transition_model(self):
+        """
+        Build the sparse transition model from main_transition_prob.
+
+        Each (s, a) has at most 3 successors: the main movement and the two
+        perpendicular movements. They are stored in fixed-width arrays:
+            successors[s, a, k]: k-th successor state (main, perp (a+1)%4, perp (a-1)%4)
+            successor_probs[s, a, k]: probability of that successor
+        A perpendicular successor that coincides with an earlier slot adds its
+        probability to that slot and gets probability 0 itself, so each distinct
+        successor is counted once and every row sums to 1 (the same dynamics as
+        transition_w_perp and sample_next_states).
+        """
+        actions = np.array(self.actions)
+        main = self.next_states
+        perp1 = self.next_states[:, (actions + 1) % 4]
+        perp2 = self.next_states[:, (actions - 1) % 4]
+        self.successors = np.stack([main, perp1, perp2], axis=2)
+
+        self.successor_probs = self.successor_probs_for(self.main_transition_prob)
+
+    def predecessors(self) -> tuple:
+        """
+        Predecessor index in CSR form, built on the first call and cached.
+
+        predecessor_states[predecessor_ptr[s']:predecessor_ptr[s' + 1]] are the
+        states that can reach s'. Only prioritized sweeping needs it, so it is
+        not part of the transition model built in the constructor.
+
+        Returns:
+            tuple: (predecessor_states, predecessor_ptr)
+        """
+        if self._predecessors is None:
+            reachable = self.successor_probs > 0
+            states = np.broadcast_to(np.arange(self.n_states)[:, None, None], self.successors.shape)
+            keys = np.unique(self.successors[reachable] * self.n_states + states[reachable])
+            next_states, predecessor_states = np.divmod(keys, self.n_states)
+            predecessor_ptr = np.searchsorted(next_states, np.arange(self.n_states + 1))
+            if self.compact:
+                predecessor_states = predecessor_states.astype(np.int32)
+                predecessor_ptr = predecessor_ptr.astype(np.int32)
+            self._predecessors = (predecessor_states, predecessor_ptr)
+        return self._predecessors
+
+    def successor_probs_for(self, main_transition_prob: float) -> np.ndarray:
+        """
+        Probabilities of the successors slots for a given main transition probability.
+
+        Args:
+            main_transition_prob (float): Probability of the intended movement
+
+        Returns:
+            np.ndarray: Probabilities aligned with self.successors, shape (n_states, n_actions, 3)
+        """
+        main, perp1, perp2 = np.moveaxis(self.successors, 2, 0)
+        perp_prob = (1 - main_transition_prob) / 2
+        # Each perpendicular movement goes to the first slot holding the same state
+        perp1_slot = np.where(perp1 == main, 0, 1)
+        perp2_slot = np.where(perp2 == main, 0, np.where(perp2 == perp1, 1, 2))
+
+        probs = np.zeros(self.successors.shape, dtype=np.float32 if self.compact else np.float64)
+        probs[:, :, 0] = main_transition_prob
+        for slot in (perp1_slot, perp2_slot):
+            probs += perp_prob * (slot[:, :, None] == np.arange(3))
+        return probs
+
+    def dense_transition_probs(self) -> np.ndarray:
+        """
+        Export the transition model as a dense (n_states, n_actions, n_states) tensor.
+        Memory grows with n_states ** 2, so only use it for small grids.
+        """
+        transition_probs = np.zeros((self.n_states, len(self.actions), self.n_states))
+        s_idx = np.arange(self.n_states)[:, None, None]
+        a_idx = np.array(self.actions)[None, :, None]
+        np.add.at(transition_probs, (s_idx, a_idx, self.successors), self.successor_probs)
+        return transition_probs
 
     def move_agent(self, action):
         self.agent_state = self.transition_w_perp(self.agent_state, action)
@@ -72,7 +276,9 @@ class GridWorld:
 
     def reset_agent(self):
         self.agent_state = self.initial_state
-        self.agent_trace = [None, self.agent_state]
+        self.agent_trace.clear()
+        self.agent_trace.append(None)
+        self.agent_trace.append(self.agent_state)
 
     def is_terminated(self):
         return self.agent_state in self.terminal_states
@@ -89,40 +295,34 @@ class GridWorld:
         #     print()
         return self.transition(state, action)
 
-    def get_possible_successors(self, state: int, action: int) -> list:
-        "Return a list of possible successor states given a state and action considering walls, boundaries, and perpendicular movements."
-        successors = set()
+    def sample_next_states(self, states: np.ndarray, actions: np.ndarray, rng=None) -> np.ndarray:
+        """
+        Sample the next state of many agents at once, with the same dynamics as
+        transition_w_perp: the main movement with main_transition_prob, otherwise
+        one of the two perpendicular movements with equal probability.
+        One uniform number per agent selects the successors slot.
 
-        # Main movement
-        main_successor = self.transition(state, action)
-        successors.add(main_successor)
+        Args:
+            states (np.ndarray): Current states, shape (n_agents,)
+            actions (np.ndarray): Actions, shape (n_agents,)
+            rng (np.random.RandomState): Random number generator (default: self.rng)
 
-        # Perpendicular movements
-        perp_action1 = (action + 1) % 4
-        perp_action2 = (action - 1) % 4
-        perp_successor1 = self.transition(state, perp_action1)
-        perp_successor2 = self.transition(state, perp_action2)
-        successors.add(perp_successor1)
-        successors.add(perp_successor2)
+        Returns:
+            np.ndarray: Next states, shape (n_agents,)
+        """
+        rng = self.rng if rng is None else rng
+        u = rng.random_sample(len(states))
+        p = self.main_transition_prob
+        # slot 0: main, 1: perp (a+1)%4, 2: perp (a-1)%4
+        slots = (u > p).astype(np.intp) + (u > p + (1 - p) / 2)
+        return self.successors[states, actions, slots]
 
-        return successors
+    def get_possible_successors(self, state: int, action: int) -> list:
+        "Return a list of possible successor states given a state and action considering walls, boundaries, and perpendicular movements."
+        return set(self.successors[state, action].tolist())
 
     def transition(self, state: int, action: int) -> int:
-        i, j = self.state_to_index(state)
-        if action == 0:  # up
-            i = i - 1
-        elif action == 1:  # right
-            j = j + 1
-        elif action == 2:  # down
-            i = i + 1
-        elif action == 3:  # left
-            j = j - 1
-        next_state = self.index_to_state(i, j)
-
-        if next_state in self.walls or i < 0 or i >= self.size or j < 0 or j >= self.size:
-            return state
-
-        return next_state
+        return int(self.next_states[state, action])
 
     def state_to_index(self, state: int) -> tuple: # index_to_coord
         return (state // self.size, state % self.size)
@@ -1,12 +1,65 @@
+import heapq
+import time
 import numpy as np
 from typing import List, Optional
 from GridWorld import GridWorld
 
 
+def bicgstab(matvec, b: np.ndarray, x0: np.ndarray, tol: float = 1e-10, max_iter: int = 1000) -> np.ndarray:
+    """
+    Solve A x = b with the stabilized biconjugate gradient method (BiCGSTAB).
+
+    A is only accessed through matvec, so it never has to be built explicitly.
+
+    Args:
+        matvec (callable): Function returning A @ x
+        b (np.ndarray): Right-hand side
+        x0 (np.ndarray): Initial guess
+        tol (float): Relative residual tolerance
+        max_iter (int): Maximum number of iterations
+
+    Returns:
+        np.ndarray: Approximate solution x
+    """
+    x = x0.copy()
+    r = b - matvec(x)
+    r_hat = r.copy()
+    b_norm = np.linalg.norm(b) or 1.0
+    if np.linalg.norm(r) < tol * b_norm:
+        return x
+
+    rho = alpha = omega = 1.0
+    v = np.zeros_like(b)
+    p = np.zeros_like(b)
+    for _ in range(max_iter):
+        rho_new = r_hat @ r
+        if rho_new == 0:
+            break
+        beta = (rho_new / rho) * (alpha / omega)
+        p = r + beta * (p - omega * v)
+        v = matvec(p)
+        alpha = rho_new / (r_hat @ v)
+        s = r - alpha * v
+        if np.linalg.norm(s) < tol * b_norm:
+            x += alpha * p
+            break
+        t = matvec(s)
+        omega = (t @ s) / (t @ t)
+        x += alpha * p + omega * s
+        r = s - omega * t
+        if np.linalg.norm(r) < tol * b_norm or omega == 0:
+            break
+        rho = rho_new
+    return x
+
+
 class RLAlgorithm:
     """Base class for Reinforcement Learning algorithms."""
 
-    def __init__(self, env: GridWorld, gamma: float = 0.9, seed: int = 42):
+    __slots__ = ('env', 'gamma', 'rng', 'compact', 'values', 'q_values', 'policy_actions', '_policy',
+                 '_policy_cdf')
+
+    def __init__(self, env: GridWorld, gamma: float = 0.9, seed: int = 42, compact: bool = False):
         """
         Initialize the Reinforcement Learning algorithm.
 
@@ -14,10 +67,13 @@ class RLAlgorithm:
             env (GridWorld): The environment to interact with
             gamma (float): Discount factor for future rewards
             seed (int): Random seed for reproducibility
+            compact (bool): Store values and Q-values as float32 and the policy as
+                one int8 action per state instead of an (n_states, n_actions) table
         """
         self.env = env
         self.gamma = gamma
         self.rng = np.random.RandomState(seed)
+        self.compact = compact
         self.reset()
 
     def reset(self) -> None:
@@ -27,13 +83,110 @@ class RLAlgorithm:
         - Set uniform initial policy
         - Reset Q-values to zeros
         """
-        self.values = np.zeros(self.env.n_states)
+        dtype = np.float32 if self.compact else np.float64
+        n_actions = len(self.env.actions)
+        self.values = np.zeros(self.env.n_states, dtype=dtype)
+        self.q_values = np.zeros((self.env.n_states, n_actions), dtype=dtype)
         # Uniform initial policy
-        self.policy = np.full(
-            (self.env.n_states, len(self.env.actions)),
-            1.0 / len(self.env.actions)
-        )
-        self.q_values = np.zeros((self.env.n_states, len(self.env.actions)))
+        if self.compact:
+            # One action per state, -1 means uniform over all actions
+            self.policy_actions = np.full(self.env.n_states, -1, dtype=np.int8)
+            self._policy = None
+        else:
+            self.policy_actions = None
+            self._policy = np.full((self.env.n_states, n_actions), 1.0 / n_actions)
+        # Cumulative policy table for sampling, built on demand
+        self._policy_cdf = None
+
+    @property
+    def policy(self) -> np.ndarray:
+        """
+        Action probabilities, shape (n_states, n_actions).
+        In compact mode the table is materialized from policy_actions on every access,
+        so writing into it has no effect, and assigning a table with stochastic
+        (neither one-hot nor uniform) rows raises ValueError. Otherwise, assign the whole table (or use
+        set_actions) rather than writing into it, so that policy_cdf is rebuilt.
+        """
+        if not self.compact:
+            return self._policy
+        return self.policy_probs(np.arange(self.env.n_states))
+
+    @policy.setter
+    def policy(self, policy: np.ndarray) -> None:
+        self._policy_cdf = None
+        if not self.compact:
+            self._policy = policy
+            return
+        # Only deterministic (one-hot) and uniform rows can be stored
+        policy = np.asarray(policy)
+        actions = np.argmax(policy, axis=1)
+        deterministic = policy[np.arange(len(policy)), actions] == 1
+        uniform = np.all(policy == 1.0 / policy.shape[1], axis=1)
+        if not np.all(deterministic | uniform):
+            raise ValueError("compact mode can only store deterministic or uniform policy rows, "
+                             f"got stochastic rows in states {np.flatnonzero(~(deterministic | uniform))[:10].tolist()}")
+        self.policy_actions = np.where(deterministic, actions, -1).astype(np.int8)
+
+    def policy_probs(self, states) -> np.ndarray:
+        """
+        Action probabilities of a state (or an array of states).
+
+        Args:
+            states (int | np.ndarray): State(s)
+
+        Returns:
+            np.ndarray: Probabilities, shape (n_actions,) or (len(states), n_actions)
+        """
+        if not self.compact:
+            return self._policy[states]
+        actions = self.policy_actions[states]
+        n_actions = len(self.env.actions)
+        probs = np.where(actions[..., None] < 0, 1.0 / n_actions,
+                         (actions[..., None] == np.arange(n_actions)).astype(float))
+        return probs.astype(np.float32)
+
+    def current_actions(self) -> tuple:
+        """
+        Current action of every state and whether the policy there is deterministic.
+
+        Returns:
+            tuple: (actions, deterministic), both shape (n_states,)
+        """
+        if self.compact:
+            return np.maximum(self.policy_actions, 0), self.policy_actions >= 0
+        actions = np.argmax(self._policy, axis=1)
+        return actions, self._policy[np.arange(self.env.n_states), actions] == 1
+
+    def set_actions(self, states: np.ndarray, actions: np.ndarray) -> None:
+        """
+        Make the policy deterministic in the given states.
+
+        Args:
+            states (np.ndarray): States to update
+            actions (np.ndarray): Action for each state
+        """
+        self._policy_cdf = None
+        if self.compact:
+            self.policy_actions[states] = actions
+        else:
+            self._policy[states] = 0
+            self._policy[states, actions] = 1
+
+    def expected_values(self, q_values: np.ndarray) -> np.ndarray:
+        """
+        State values under the current policy, V(s) = sum_a pi(a | s) Q(s, a).
+
+        Args:
+            q_values (np.ndarray): Q-values, shape (n_states, n_actions)
+
+        Returns:
+            np.ndarray: Values, shape (n_states,)
+        """
+        if not self.compact:
+            return np.sum(self._policy * q_values, axis=1)
+        actions, deterministic = self.current_actions()
+        chosen = q_values[np.arange(self.env.n_states), actions]
+        return np.where(deterministic, chosen, np.mean(q_values, axis=1)).astype(q_values.dtype)
 
     def set_seed(self, seed: int) -> None:
         """
@@ -83,7 +236,7 @@ class RLAlgorithm:
         Returns:
             int: Selected action
         """
-        return self.rng.choice(self.env.actions, p=self.policy[state])
+        return int(self.select_policy_actions(np.array([state]))[0])
 
     def select_greedy_action(self, state: int) -> int:
         """
@@ -95,12 +248,141 @@ class RLAlgorithm:
         Returns:
             int: Action with highest probability
         """
-        return np.argmax(self.policy[state])
+        return np.argmax(self.policy_probs(state))
+
+    def policy_cdf(self) -> np.ndarray:
+        """
+        Cumulative action probabilities of every state, cached until the policy changes.
+
+        Returns:
+            np.ndarray: Cumulative distributions, shape (n_states, n_actions), last column 1
+        """
+        if self._policy_cdf is None:
+            self._policy_cdf = np.cumsum(self.policy, axis=1)
+            self._policy_cdf /= self._policy_cdf[:, -1:]
+        return self._policy_cdf
+
+    def select_actions(self, states: np.ndarray) -> np.ndarray:
+        """
+        Batched select_action for many states.
+
+        Args:
+            states (np.ndarray): Current states
+
+        Raises:
+            NotImplementedError: Must be implemented by subclasses
+        """
+        raise NotImplementedError
+
+    def select_policy_actions(self, states: np.ndarray) -> np.ndarray:
+        """
+        Sample actions from the current policy for many states at once,
+        by inverse-CDF sampling with one uniform number per state.
+
+        Args:
+            states (np.ndarray): Current states, shape (n,)
+
+        Returns:
+            np.ndarray: Selected actions, shape (n,)
+        """
+        n_actions = len(self.env.actions)
+        u = self.rng.random_sample(len(states))
+        if self.compact:
+            actions = self.policy_actions[states]
+            return np.where(actions >= 0, actions, (u * n_actions).astype(np.intp))
+        # The first action whose cumulative probability exceeds u
+        actions = np.sum(self.policy_cdf()[states] <= u[:, None], axis=1)
+        return np.minimum(actions, n_actions - 1)
+
+    def select_greedy_actions(self, states: np.ndarray) -> np.ndarray:
+        """
+        Select the action with the highest probability in the policy for many states.
+
+        Args:
+            states (np.ndarray): Current states, shape (n,)
+
+        Returns:
+            np.ndarray: Actions with highest probability, shape (n,)
+        """
+        if self.compact:
+            return np.maximum(self.policy_actions[states], 0).astype(np.intp)
+        return np.argmax(self._policy[states], axis=1)
+
+    def select_epsilon_greedy_actions(self, states: np.ndarray, epsilon: float) -> np.ndarray:
+        """
+        Select greedy actions, each replaced by a uniformly random action with probability epsilon.
+
+        Args:
+            states (np.ndarray): Current states, shape (n,)
+            epsilon (float): Exploration rate
+
+        Returns:
+            np.ndarray: Selected actions, shape (n,)
+        """
+        return self.explore(self.select_greedy_actions(states), epsilon)
+
+    def explore(self, actions: np.ndarray, epsilon: float) -> np.ndarray:
+        """
+        Replace each action by a uniformly random one with probability epsilon.
+        One uniform number per action decides both whether and which action.
+
+        Args:
+            actions (np.ndarray): Actions, shape (n,)
+            epsilon (float): Exploration rate
+
+        Returns:
+            np.ndarray: Actions, shape (n,)
+        """
+        if epsilon <= 0:
+            return actions
+        u = self.rng.random_sample(len(actions))
+        explore = u < epsilon
+        # u / epsilon is uniform on [0, 1) given u < epsilon
+        random_actions = np.minimum((u / epsilon * len(self.env.actions)).astype(np.intp),
+                                    len(self.env.actions) - 1)
+        return np.where(explore, random_actions, actions)
 
 
 class GeneralizedPolicyIteration(RLAlgorithm):
     """Base class for Generalized Policy Iteration algorithms."""
 
+    __slots__ = ('sweeps', 'backups', 'changed_states')
+
+    def reset(self) -> None:
+        """
+        Reset the algorithm's internal state and the sweep/backup counters.
+        """
+        super().reset()
+        # Number of policy evaluation steps and single-state value backups performed
+        self.sweeps = 0
+        self.backups = 0
+        # States whose action changed in the last policy improvement
+        self.changed_states = np.arange(0)
+
+    def bellman_backup(self, values: np.ndarray) -> np.ndarray:
+        """
+        Compute Q-values for every state-action pair in one expression.
+
+        Q(s, a) = sum_s' P(s' | s, a) * (R(s') + gamma * V(s'))
+
+        Args:
+            values (np.ndarray): State values V, shape (n_states,)
+
+        Returns:
+            np.ndarray: Q-values, shape (n_states, n_actions)
+        """
+        targets = self.env.rewards + self.gamma * values
+        return np.sum(self.env.successor_probs * targets[self.env.successors], axis=2)
+
+    def updatable_states(self) -> np.ndarray:
+        """
+        Boolean mask of states whose values are updated (not terminal, not a wall).
+
+        Returns:
+            np.ndarray: Mask, shape (n_states,)
+        """
+        return ~(self.env.terminal_mask | self.env.wall_mask)
+
     def policy_evaluation_step(self, theta: float = 1e-6) -> float:
         """
         Single step of policy evaluation.
@@ -124,30 +406,34 @@ class GeneralizedPolicyIteration(RLAlgorithm):
 
     def greedy_policy_improvement(self) -> bool:
         """
-        Improve policy greedily based on current Q-values.
+        Improve policy greedily based on current Q-values, for all states at once.
+
+        Ties are broken deterministically: the current action is kept if the
+        policy is already deterministic and that action is within 1e-10 of the
+        best Q-value, otherwise the lowest-index best action is chosen.
+        The states whose action changed are stored in self.changed_states.
 
         Returns:
             bool: Whether the policy has converged
         """
-        is_policy_converged = True
-        for s in range(self.env.n_states):
-            if s in self.env.terminal_states:
-                continue
-
-            old_policy = self.policy[s].copy()
+        states = np.arange(self.env.n_states)
 
-            # Reset policy probabilities
-            self.policy[s] = np.zeros(len(self.env.actions))
+        # Select best action, keeping the current deterministic action on (near) ties
+        # so that exact evaluation does not flip between equally good actions
+        best_actions = np.argmax(self.q_values, axis=1)
+        current_actions, deterministic = self.current_actions()
+        keep = deterministic & (self.q_values[states, current_actions] >=
+                                self.q_values[states, best_actions] - 1e-10)
+        best_actions = np.where(keep, current_actions, best_actions)
 
-            # Select best action
-            best_action = np.argmax(self.q_values[s])
-            self.policy[s, best_action] = 1
+        # Terminal states keep their policy
+        changed = ~self.env.terminal_mask & (~deterministic | (best_actions != current_actions))
+        self.changed_states = np.flatnonzero(changed)
 
-            # Check if policy changed
-            if not np.array_equal(old_policy, self.policy[s]):
-                is_policy_converged = False
+        # Rewrite only the changed states as deterministic policies
+        self.set_actions(self.changed_states, best_actions[self.changed_states])
 
-        return is_policy_converged
+        return self.changed_states.size == 0
 
     def step(self) -> bool:
         """
@@ -175,41 +461,111 @@ class GeneralizedPolicyIteration(RLAlgorithm):
 class PolicyIteration(GeneralizedPolicyIteration):
     """Policy Iteration algorithm implementation."""
 
+    __slots__ = ('evaluation', 'partial_sweeps')
+
+    # Largest number of states solved with a dense direct solver in "exact" mode
+    DENSE_SOLVE_LIMIT = 2500
+
+    def __init__(self, env: GridWorld, gamma: float = 0.9, seed: int = 42,
+                 evaluation: str = "sweep", partial_sweeps: int = 5, compact: bool = False):
+        """
+        Initialize Policy Iteration.
+
+        Args:
+            env (GridWorld): The environment to interact with
+            gamma (float): Discount factor for future rewards
+            seed (int): Random seed for reproducibility
+            evaluation (str): How a policy evaluation step is performed
+                "sweep": one Bellman expectation sweep
+                "modified": partial_sweeps sweeps (modified policy iteration)
+                "exact": solve (I - gamma * P_pi) V = R_pi directly
+            partial_sweeps (int): Number of sweeps per step in "modified" mode
+            compact (bool): Use compact float32 / int8 storage (see RLAlgorithm)
+        """
+        if evaluation not in ("sweep", "modified", "exact"):
+            raise ValueError(f"Unknown evaluation mode: {evaluation}")
+        self.evaluation = evaluation
+        self.partial_sweeps = partial_sweeps
+        super().__init__(env, gamma, seed, compact)
+
     def policy_evaluation_step(self) -> float:
         """
-        Perform a single policy evaluation step.
+        Perform a single policy evaluation step according to the evaluation mode.
 
         Returns:
             float: Maximum value change during evaluation
         """
-        delta = 0
-        old_values = self.values.copy()
+        if self.evaluation == "exact":
+            return self.exact_policy_evaluation()
+        if self.evaluation == "modified":
+            delta = 0.0
+            for _ in range(self.partial_sweeps):
+                delta = self.bellman_expectation_sweep()
+            return delta
+        return self.bellman_expectation_sweep()
+
+    def exact_policy_evaluation(self) -> float:
+        """
+        Evaluate the current policy exactly by solving (I - gamma * P_pi) V = R_pi.
 
-        for s in range(self.env.n_states):
-            # Skip terminal and wall states
-            if s in self.env.terminal_states or s in self.env.walls:
-                continue
+        Terminal and wall states keep a value of 0. Small problems use a dense
+        direct solver, larger ones the matrix-free BiCGSTAB solver.
 
-            # Compute state value under current policy
-            v = 0
-            for a in self.env.actions:
-                q = 0
-                for s_prime in self.env.get_possible_successors(s, a):
-                    # Bellman expectation equation
-                    q += (self.env.transition_probs[s, a, s_prime] *
-                          (self.env.rewards[s_prime] + self.gamma * old_values[s_prime]))
-
-                # Store Q-values
-                self.q_values[s, a] = q
-                # Weighted sum by policy probabilities
-                v += self.policy[s, a] * q
-
-            # Update state value
-            self.values[s] = v
-            # Track maximum value change
-            delta = max(delta, np.abs(old_values[s] - self.values[s]))
+        Returns:
+            float: Maximum value change during evaluation
+        """
+        mask = self.updatable_states()
+
+        # Policy-weighted successor probabilities, shape (n_states, n_actions, 3)
+        weights = self.policy[:, :, None] * self.env.successor_probs
+        weights[~mask] = 0.0
+        # Expected reward of the next transition under the policy
+        r_pi = np.sum(weights * self.env.rewards[self.env.successors], axis=(1, 2))
+
+        if self.env.n_states <= self.DENSE_SOLVE_LIMIT:
+            p_pi = np.zeros((self.env.n_states, self.env.n_states))
+            s_idx = np.broadcast_to(np.arange(self.env.n_states)[:, None, None], weights.shape)
+            np.add.at(p_pi, (s_idx, self.env.successors), weights)
+            new_values = np.linalg.solve(np.eye(self.env.n_states) - self.gamma * p_pi, r_pi)
+        else:
+            def matvec(v):
+                return v - self.gamma * np.sum(weights * v[self.env.successors], axis=(1, 2))
+            new_values = bicgstab(matvec, r_pi, np.where(mask, self.values, 0.0))
+
+        delta = np.max(np.abs(new_values - self.values), where=mask, initial=0.0)
+        self.values[mask] = new_values[mask]
+        self.q_values[mask] = self.bellman_backup(self.values)[mask]
+
+        self.sweeps += 1
+        self.backups += int(np.count_nonzero(mask))
+
+        return float(delta)
+
+    def bellman_expectation_sweep(self) -> float:
+        """
+        Perform a single synchronous Bellman expectation sweep.
 
-        return delta
+        Returns:
+            float: Maximum value change during evaluation
+        """
+        # Skip terminal and wall states
+        mask = self.updatable_states()
+
+        # Bellman expectation equation for all states at once
+        q_values = self.bellman_backup(self.values)
+        new_values = self.expected_values(q_values)
+
+        # Track maximum value change
+        delta = np.max(np.abs(new_values - self.values), where=mask, initial=0.0)
+
+        # Store Q-values and update state values
+        self.q_values[mask] = q_values[mask]
+        self.values[mask] = new_values[mask]
+
+        self.sweeps += 1
+        self.backups += int(np.count_nonzero(mask))
+
+        return float(delta)
 
     def policy_improvement_step(self) -> bool:
         """
@@ -235,10 +591,24 @@ class PolicyIteration(GeneralizedPolicyIteration):
         """
         return self.select_policy_action(state)
 
+    def select_actions(self, states: np.ndarray) -> np.ndarray:
+        """
+        Select actions according to current policy for many states.
+
+        Args:
+            states (np.ndarray): Current states
+
+        Returns:
+            np.ndarray: Selected actions
+        """
+        return self.select_policy_actions(states)
+
 
 class ValueIteration(GeneralizedPolicyIteration):
     """Value Iteration algorithm implementation."""
 
+    __slots__ = ()
+
     def policy_evaluation_step(self) -> float:
         """
         Perform a single value iteration step.
@@ -246,32 +616,24 @@ class ValueIteration(GeneralizedPolicyIteration):
         Returns:
             float: Maximum value change during iteration
         """
-        delta = 0
-        old_values = self.values.copy()
+        # Skip terminal and wall states
+        mask = self.updatable_states()
 
-        for s in range(self.env.n_states):
-            # Skip terminal and wall states
-            if s in self.env.terminal_states or s in self.env.walls:
-                continue
+        # Bellman optimality equation for all states at once
+        q_values = self.bellman_backup(self.values)
+        new_values = np.max(q_values, axis=1)
 
-            # Compute maximum Q-value across all actions
-            q_values = []
-            for a in self.env.actions:
-                q = 0
-                for s_prime in self.env.get_possible_successors(s, a):
-                    # Bellman optimality equation
-                    q += (self.env.transition_probs[s, a, s_prime] *
-                          (self.env.rewards[s_prime] + self.gamma * old_values[s_prime]))
-                q_values.append(q)
-
-            # Update Q-values and state value
-            self.q_values[s] = q_values
-            self.values[s] = max(q_values)
+        # Track maximum value change
+        delta = np.max(np.abs(new_values - self.values), where=mask, initial=0.0)
 
-            # Track maximum value change
-            delta = max(delta, np.abs(old_values[s] - self.values[s]))
+        # Update Q-values and state values
+        self.q_values[mask] = q_values[mask]
+        self.values[mask] = new_values[mask]
 
-        return delta
+        self.sweeps += 1
+        self.backups += int(np.count_nonzero(mask))
+
+        return float(delta)
 
     def policy_improvement_step(self) -> bool:
         """
@@ -296,3 +658,784 @@ class ValueIteration(GeneralizedPolicyIteration):
             int: Selected action
         """
         return self.select_greedy_action(state)
+
+    def select_actions(self, states: np.ndarray) -> np.ndarray:
+        """
+        Select greedy actions for many states.
+
+        Args:
+            states (np.ndarray): Current states
+
+        Returns:
+            np.ndarray: Selected actions
+        """
+        return self.select_greedy_actions(states)
+
+
+class GaussSeidelValueIteration(ValueIteration):
+    """
+    In-place (Gauss-Seidel) Value Iteration.
+
+    States are updated in a red-black (checkerboard) order: every successor of a
+    state is either the state itself or a 4-neighbour of the other colour, so all
+    states of one colour can be backed up at once using the freshly updated
+    values of the other colour.
+    """
+
+    __slots__ = ('color_groups',)
+
+    def reset(self) -> None:
+        """
+        Reset the algorithm's internal state and precompute the colour groups.
+        """
+        super().reset()
+        i, j = np.divmod(np.arange(self.env.n_states), self.env.size)
+        mask = self.updatable_states()
+        self.color_groups = [np.flatnonzero(mask & ((i + j) % 2 == c)) for c in (0, 1)]
+
+    def policy_evaluation_step(self) -> float:
+        """
+        Perform a single in-place value iteration sweep.
+
+        Returns:
+            float: Maximum value change during iteration
+        """
+        delta = 0.0
+        for states in self.color_groups:
+            # Bellman optimality equation using the latest values
+            targets = self.env.rewards + self.gamma * self.values
+            q_values = np.sum(self.env.successor_probs[states] * targets[self.env.successors[states]], axis=2)
+            new_values = np.max(q_values, axis=1)
+
+            # Track maximum value change
+            delta = max(delta, float(np.max(np.abs(new_values - self.values[states]), initial=0.0)))
+
+            # Update Q-values and state values in place
+            self.q_values[states] = q_values
+            self.values[states] = new_values
+            self.backups += len(states)
+
+        self.sweeps += 1
+        return delta
+
+    def __str__(self) -> str:
+        return "Gauss-Seidel Value Iteration"
+
+
+class PrioritizedSweepingValueIteration(ValueIteration):
+    """
+    Value Iteration with prioritized sweeping.
+
+    States are backed up in order of their Bellman error, kept in a priority
+    queue. After a state is backed up, only its predecessors (from
+    GridWorld.predecessors()) are re-examined and re-queued.
+    """
+
+    __slots__ = ('theta', 'backups_per_step', 'updatable', 'priorities', 'queue')
+
+    def __init__(self, env: GridWorld, gamma: float = 0.9, seed: int = 42,
+                 theta: float = 1e-6, backups_per_step: Optional[int] = None, compact: bool = False):
+        """
+        Initialize prioritized sweeping.
+
+        Args:
+            env (GridWorld): The environment to interact with
+            gamma (float): Discount factor for future rewards
+            seed (int): Random seed for reproducibility
+            theta (float): States with a Bellman error below theta are not queued
+            backups_per_step (int): Backups per evaluation step (default: n_states)
+            compact (bool): Use compact float32 / int8 storage (see RLAlgorithm)
+        """
+        self.theta = theta
+        self.backups_per_step = env.n_states if backups_per_step is None else backups_per_step
+        super().__init__(env, gamma, seed, compact)
+
+    def reset(self) -> None:
+        """
+        Reset the algorithm's internal state and seed the priority queue
+        with the Bellman error of every state.
+        """
+        super().reset()
+        self.updatable = self.updatable_states()
+
+        q_values = self.bellman_backup(self.values)
+        errors = np.abs(np.max(q_values, axis=1) - self.values)
+        errors[~self.updatable | (errors <= self.theta)] = 0.0
+
+        # Current priority of each state (0 if not queued), stale heap entries are skipped
+        self.priorities = errors
+        self.queue = [(-errors[s], s) for s in np.flatnonzero(errors).tolist()]
+        heapq.heapify(self.queue)
+
+    def state_backup(self, states) -> np.ndarray:
+        """
+        Compute the Q-values of a state (or an array of states) from the current values.
+
+        Args:
+            states (int | np.ndarray): State(s) to back up
+
+        Returns:
+            np.ndarray: Q-values, shape (n_actions,) or (len(states), n_actions)
+        """
+        successors = self.env.successors[states]
+        targets = self.env.rewards[successors] + self.gamma * self.values[successors]
+        return np.sum(self.env.successor_probs[states] * targets, axis=-1)
+
+    def policy_evaluation_step(self) -> float:
+        """
+        Perform up to backups_per_step prioritized backups.
+
+        Returns:
+            float: Maximum value change during iteration
+        """
+        delta = 0.0
+        n_backups = 0
+        predecessor_states, ptr = self.env.predecessors()
+        while self.queue and n_backups < self.backups_per_step:
+            priority, s = heapq.heappop(self.queue)
+            if -priority != self.priorities[s]:
+                continue
+            self.priorities[s] = 0.0
+
+            # Bellman optimality backup of the highest-priority state
+            q_values = self.state_backup(s)
+            new_value = q_values.max()
+            delta = max(delta, abs(new_value - self.values[s]))
+            self.q_values[s] = q_values
+            self.values[s] = new_value
+            n_backups += 1
+
+            # Re-examine the predecessors whose backups depend on s
+            predecessors = predecessor_states[ptr[s]:ptr[s + 1]]
+            predecessors = predecessors[self.updatable[predecessors]]
+            errors = np.abs(np.max(self.state_backup(predecessors), axis=-1) - self.values[predecessors])
+            raised = (errors > self.theta) & (errors > self.priorities[predecessors])
+            for p, error in zip(predecessors[raised].tolist(), errors[raised].tolist()):
+                self.priorities[p] = error
+                heapq.heappush(self.queue, (-error, p))
+
+        self.sweeps += 1
+        self.backups += n_backups
+        return float(delta)
+
+    def __str__(self) -> str:
+        return "Prioritized Sweeping"
+
+
+class TemporalDifferenceLearning(RLAlgorithm):
+    """
+    Base class for model-free tabular TD control (Q-learning, SARSA).
+
+    Instead of sweeping the transition model, n_agents agents act epsilon-greedily
+    in the environment at the same time. Each rollout step advances all agents with
+    one GridWorld.sample_next_states call and applies one batched Q-value update:
+    the TD errors of agents that visited the same (s, a) pair are averaged, so the
+    update does not scale with the number of agents.
+    Agents that reach a terminal state (or max_episode_steps) restart from the
+    initial state and their undiscounted return is appended to episode_returns.
+    """
+
+    __slots__ = ('alpha', 'epsilon', 'n_agents', 'steps_per_update', 'max_episode_steps',
+                 'agent_states', 'agent_actions', 'agent_steps', 'agent_returns',
+                 'episode_returns', 'transitions')
+
+    def __init__(self, env: GridWorld, gamma: float = 0.9, seed: int = 42, alpha: float = 0.1,
+                 epsilon: float = 0.1, n_agents: int = 1024, steps_per_update: int = 10,
+                 max_episode_steps: int = 1000, compact: bool = False):
+        """
+        Args:
+            env (GridWorld): The environment to interact with
+            gamma (float): Discount factor for future rewards
+            seed (int): Random seed for reproducibility
+            alpha (float): Learning rate
+            epsilon (float): Exploration rate of the epsilon-greedy behaviour policy
+            n_agents (int): Number of agents acting in parallel
+            steps_per_update (int): Rollout steps per policy_evaluation_step
+            max_episode_steps (int): Episodes longer than this are restarted
+            compact (bool): Use compact float32 / int8 storage (see RLAlgorithm)
+        """
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.n_agents = n_agents
+        self.steps_per_update = steps_per_update
+        self.max_episode_steps = max_episode_steps
+        super().__init__(env, gamma, seed, compact)
+
+    def reset(self) -> None:
+        """
+        Reset the Q-values, the policy and all agents to the initial state.
+        """
+        super().reset()
+        self.agent_states = np.full(self.n_agents, self.env.initial_state, dtype=np.intp)
+        self.agent_actions = self.epsilon_greedy_actions(self.agent_states)
+        self.agent_steps = np.zeros(self.n_agents, dtype=np.int64)
+        self.agent_returns = np.zeros(self.n_agents)
+        # Undiscounted returns of the finished episodes, in order of completion
+        self.episode_returns = []
+        # Number of sampled transitions
+        self.transitions = 0
+
+    def epsilon_greedy_actions(self, states: np.ndarray) -> np.ndarray:
+        """
+        Sample epsilon-greedy actions w.r.t. the current Q-values for many states.
+        Ties between best actions are broken uniformly at random.
+
+        Args:
+            states (np.ndarray): States, shape (n_agents,)
+
+        Returns:
+            np.ndarray: Actions, shape (n_agents,)
+        """
+        q_values = self.q_values[states]
+        is_best = q_values == np.max(q_values, axis=1, keepdims=True)
+        greedy = np.argmax(np.where(is_best, self.rng.random_sample(q_values.shape), -1.0), axis=1)
+        return self.explore(greedy, self.epsilon)
+
+    def td_targets(self, rewards: np.ndarray, next_states: np.ndarray,
+                   next_actions: np.ndarray) -> np.ndarray:
+        """
+        Bootstrapped targets R(s') + gamma * Q(s', .) of the sampled transitions.
+
+        Raises:
+            NotImplementedError: Must be implemented by subclasses
+        """
+        raise NotImplementedError
+
+    def rollout_step(self) -> float:
+        """
+        Advance every agent by one step and update the Q-values.
+
+        Returns:
+            float: Maximum Q-value change
+        """
+        states, actions = self.agent_states, self.agent_actions
+        next_states = self.env.sample_next_states(states, actions, self.rng)
+        rewards = self.env.rewards[next_states]
+        next_actions = self.epsilon_greedy_actions(next_states)
+
+        # Terminal states have no future value
+        targets = self.td_targets(rewards, next_states, next_actions)
+        targets = np.where(self.env.terminal_mask[next_states], rewards, targets)
+
+        # Average the TD errors of agents sharing a (s, a) pair
+        n_actions = len(self.env.actions)
+        pairs = states * n_actions + actions
+        errors = targets - self.q_values[states, actions]
+        error_sums = np.bincount(pairs, weights=errors, minlength=self.q_values.size)
+        counts = np.bincount(pairs, minlength=self.q_values.size)
+        visited = np.flatnonzero(counts)
+        change = self.alpha * error_sums[visited] / counts[visited]
+        self.q_values.reshape(-1)[visited] += change.astype(self.q_values.dtype)
+
+        # Bookkeeping of episodes
+        self.agent_steps += 1
+        self.agent_returns += rewards
+        self.transitions += self.n_agents
+        done = self.env.terminal_mask[next_states] | (self.agent_steps >= self.max_episode_steps)
+        if done.any():
+            self.episode_returns.extend(self.agent_returns[done].tolist())
+            self.agent_returns[done] = 0
+            self.agent_steps[done] = 0
+            next_states = np.where(done, self.env.initial_state, next_states)
+            next_actions[done] = self.epsilon_greedy_actions(next_states[done])
+
+        self.agent_states = next_states
+        self.agent_actions = next_actions
+        return float(np.max(np.abs(change), initial=0.0))
+
+    def policy_evaluation_step(self) -> float:
+        """
+        Run steps_per_update rollout steps and refresh the state values V(s) = max_a Q(s, a).
+
+        Returns:
+            float: Maximum Q-value change over the rollout steps
+        """
+        delta = max(self.rollout_step() for _ in range(self.steps_per_update))
+        self.values[:] = np.max(self.q_values, axis=1)
+        return delta
+
+    def policy_improvement_step(self) -> bool:
+        """
+        Make the policy greedy w.r.t. the current Q-values (terminal states keep their policy).
+
+        Returns:
+            bool: Whether the policy is unchanged
+        """
+        best_actions = np.argmax(self.q_values, axis=1)
+        current_actions, deterministic = self.current_actions()
+        changed = np.flatnonzero(~self.env.terminal_mask & (~deterministic | (best_actions != current_actions)))
+        self.set_actions(changed, best_actions[changed])
+        return changed.size == 0
+
+    def step(self, theta: float = 1e-6) -> bool:
+        """
+        Single learning step: rollouts followed by greedy policy improvement.
+
+        Args:
+            theta (float): Convergence threshold on the Q-value change
+
+        Returns:
+            bool: Whether the policy is unchanged and the Q-values changed less than theta
+        """
+        delta = self.policy_evaluation_step()
+        return self.policy_improvement_step() and delta < theta
+
+    def run(self, n_transitions: int) -> None:
+        """
+        Learn until at least n_transitions transitions have been sampled.
+
+        Args:
+            n_transitions (int): Number of transitions summed over all agents
+        """
+        while self.transitions < n_transitions:
+            self.policy_evaluation_step()
+        self.policy_improvement_step()
+
+    def select_action(self, state: int) -> int:
+        """
+        Select greedy action based on the learned policy.
+
+        Args:
+            state (int): Current state
+
+        Returns:
+            int: Selected action
+        """
+        return self.select_greedy_action(state)
+
+    def select_actions(self, states: np.ndarray) -> np.ndarray:
+        """
+        Select greedy actions for many states.
+
+        Args:
+            states (np.ndarray): Current states
+
+        Returns:
+            np.ndarray: Selected actions
+        """
+        return self.select_greedy_actions(states)
+
+
+class QLearning(TemporalDifferenceLearning):
+    """Off-policy TD control: bootstraps from the best next action."""
+
+    __slots__ = ()
+
+    def td_targets(self, rewards: np.ndarray, next_states: np.ndarray,
+                   next_actions: np.ndarray) -> np.ndarray:
+        """
+        Q-learning targets R(s') + gamma * max_a' Q(s', a').
+
+        Args:
+            rewards (np.ndarray): Rewards of the transitions
+            next_states (np.ndarray): Next states
+            next_actions (np.ndarray): Next actions of the behaviour policy (unused)
+
+        Returns:
+            np.ndarray: Targets, shape (n_agents,)
+        """
+        return rewards + self.gamma * np.max(self.q_values[next_states], axis=1)
+
+    def __str__(self) -> str:
+        return "Q-Learning"
+
+
+class SARSA(TemporalDifferenceLearning):
+    """On-policy TD control: bootstraps from the next action actually taken."""
+
+    __slots__ = ()
+
+    def td_targets(self, rewards: np.ndarray, next_states: np.ndarray,
+                   next_actions: np.ndarray) -> np.ndarray:
+        """
+        SARSA targets R(s') + gamma * Q(s', a') with a' from the behaviour policy.
+
+        Args:
+            rewards (np.ndarray): Rewards of the transitions
+            next_states (np.ndarray): Next states
+            next_actions (np.ndarray): Next actions of the behaviour policy
+
+        Returns:
+            np.ndarray: Targets, shape (n_agents,)
+        """
+        return rewards + self.gamma * self.q_values[next_states, next_actions]
+
+    def __str__(self) -> str:
+        return "SARSA"
+
+
+class MonteCarloPolicyEvaluation(RLAlgorithm):
+    """
+    Monte Carlo estimation of the value function of a fixed policy.
+
+    Each evaluation step samples n_episodes episodes in lockstep: actions are drawn
+    by inverse-CDF sampling over the cumulative policy table and next states with
+    GridWorld.sample_next_states, so one step of all episodes costs a few array
+    operations. V(s) is the mean of the observed returns, using either the first
+    visit of s in each episode or every visit.
+    Episodes are cut after max_episode_steps; visits of a cut episode are only used
+    while the discounted weight of the missing tail, gamma ** (steps left), is below
+    TRUNCATION_TOL, so the estimates stay (nearly) unbiased.
+    Confidence intervals treat the episodes as independent clusters of visits, so
+    they also hold for every-visit estimates, whose returns within an episode are
+    correlated.
+    """
+
+    __slots__ = ('target_policy', 'first_visit', 'exploring_starts', 'n_episodes', 'max_episode_steps',
+                 'returns_sum', 'visit_counts', 'episode_counts', 'returns_sq_sum', 'returns_visits_sum',
+                 'visits_sq_sum', 'episodes', 'sampling_time')
+
+    # Largest discount weight of the missing tail for a visit of a cut episode to be used
+    TRUNCATION_TOL = 1e-6
+
+    def __init__(self, env: GridWorld, gamma: float = 0.9, seed: int = 42,
+                 policy: Optional[np.ndarray] = None, first_visit: bool = True,
+                 exploring_starts: bool = True, n_episodes: int = 1000,
+                 max_episode_steps: int = 1000, compact: bool = False):
+        """
+        Args:
+            env (GridWorld): The environment to interact with
+            gamma (float): Discount factor for future rewards
+            seed (int): Random seed for reproducibility
+            policy (np.ndarray): Policy to evaluate, shape (n_states, n_actions) (default: uniform)
+            first_visit (bool): First-visit (True) or every-visit (False) Monte Carlo
+            exploring_starts (bool): Start episodes in uniformly random non-terminal states
+                instead of the initial state, so that every state gets estimates
+            n_episodes (int): Episodes sampled per policy_evaluation_step
+            max_episode_steps (int): Maximum episode length
+            compact (bool): Use compact float32 / int8 storage (see RLAlgorithm)
+        """
+        self.target_policy = policy
+        self.first_visit = first_visit
+        self.exploring_starts = exploring_starts
+        self.n_episodes = n_episodes
+        self.max_episode_steps = max_episode_steps
+        super().__init__(env, gamma, seed, compact)
+
+    def reset(self) -> None:
+        """
+        Reset the estimates and the sampling statistics.
+        """
+        super().reset()
+        if self.target_policy is not None:
+            self.policy = np.array(self.target_policy, dtype=float)
+        # Sufficient statistics of the sampled returns per state. With S and N the sum of the
+        # returns and the number of visits of s in one episode, summed over the episodes:
+        self.returns_sum = np.zeros(self.env.n_states)                  # sum of S
+        self.visit_counts = np.zeros(self.env.n_states, dtype=np.int64)  # sum of N
+        self.episode_counts = np.zeros(self.env.n_states, dtype=np.int64)  # episodes with N > 0
+        self.returns_sq_sum = np.zeros(self.env.n_states)               # sum of S ** 2
+        self.returns_visits_sum = np.zeros(self.env.n_states)           # sum of S * N
+        self.visits_sq_sum = np.zeros(self.env.n_states)                # sum of N ** 2
+        self.episodes = 0
+        self.sampling_time = 0.0
+
+    def sample_episodes(self, n_episodes: int) -> tuple:
+        """
+        Sample episodes in parallel and compute the discounted return of every step.
+
+        Args:
+            n_episodes (int): Number of episodes
+
+        Returns:
+            tuple: (states, returns, usable), each shape (n_episodes, n_steps);
+                usable marks the steps taken before the episode ended whose returns
+                are not cut short by max_episode_steps
+        """
+        if self.exploring_starts:
+            start_states = np.flatnonzero(~(self.env.terminal_mask | self.env.wall_mask))
+            current = start_states[self.rng.randint(len(start_states), size=n_episodes)]
+        else:
+            current = np.full(n_episodes, self.env.initial_state, dtype=np.intp)
+
+        states = np.zeros((n_episodes, self.max_episode_steps), dtype=np.intp)
+        rewards = np.zeros((n_episodes, self.max_episode_steps))
+        alive = np.zeros((n_episodes, self.max_episode_steps), dtype=bool)
+        running = np.ones(n_episodes, dtype=bool)
+
+        n_steps = 0
+        while n_steps < self.max_episode_steps and running.any():
+            states[:, n_steps] = current
+            alive[:, n_steps] = running
+
+            actions = self.select_policy_actions(current)
+            current = self.env.sample_next_states(current, actions, self.rng)
+
+            rewards[:, n_steps] = np.where(running, self.env.rewards[current], 0.0)
+            running &= ~self.env.terminal_mask[current]
+            n_steps += 1
+
+        # G_t = r_t + gamma * G_{t+1}, rewards after the end of an episode are 0
+        returns = np.empty((n_episodes, n_steps))
+        discounted = np.zeros(n_episodes)
+        for t in range(n_steps - 1, -1, -1):
+            discounted = rewards[:, t] + self.gamma * discounted
+            returns[:, t] = discounted
+
+        # Drop the visits of cut episodes that are too close to the cut
+        tail_weights = self.gamma ** (n_steps - np.arange(n_steps))
+        usable = alive[:, :n_steps] & ~(running[:, None] & (tail_weights > self.TRUNCATION_TOL))
+
+        return states[:, :n_steps], returns, usable
+
+    def policy_evaluation_step(self) -> float:
+        """
+        Sample n_episodes episodes and update the value estimates.
+
+        Returns:
+            float: Maximum change of the value estimates
+        """
+        start = time.perf_counter()
+        states, returns, alive = self.sample_episodes(self.n_episodes)
+
+        # Visits in (episode, time) order
+        n_states = self.env.n_states
+        visited = states[alive]
+        visit_returns = returns[alive]
+        keys, first, inverse = np.unique(np.nonzero(alive)[0] * n_states + visited,
+                                         return_index=True, return_inverse=True)
+        if self.first_visit:
+            episode_returns = visit_returns[first]
+            episode_visits = np.ones(len(keys))
+        else:
+            episode_returns = np.bincount(inverse, weights=visit_returns, minlength=len(keys))
+            episode_visits = np.bincount(inverse, minlength=len(keys)).astype(float)
+
+        # Per (episode, state) sums S and N, accumulated per state
+        episode_states = keys % n_states
+        self.returns_sum += np.bincount(episode_states, weights=episode_returns, minlength=n_states)
+        self.visit_counts += np.bincount(episode_states, weights=episode_visits,
+                                         minlength=n_states).astype(np.int64)
+        self.episode_counts += np.bincount(episode_states, minlength=n_states)
+        self.returns_sq_sum += np.bincount(episode_states, weights=episode_returns ** 2, minlength=n_states)
+        self.returns_visits_sum += np.bincount(episode_states, weights=episode_returns * episode_visits,
+                                               minlength=n_states)
+        self.visits_sq_sum += np.bincount(episode_states, weights=episode_visits ** 2, minlength=n_states)
+        self.episodes += self.n_episodes
+        self.sampling_time += time.perf_counter() - start
+
+        mask = self.visit_counts > 0
+        new_values = self.returns_sum[mask] / self.visit_counts[mask]
+        delta = np.max(np.abs(new_values - self.values[mask]), initial=0.0)
+        self.values[mask] = new_values
+        return float(delta)
+
+    def confidence_intervals(self, z: float = 1.96) -> tuple:
+        """
+        Normal-approximation confidence intervals of the value estimates.
+
+        V(s) = sum S / sum N is a ratio estimator over the n episodes that visit s,
+        with variance sum (S - V(s) N) ** 2 * n / ((n - 1) * (sum N) ** 2).
+        For first-visit estimates (N = 1) this is the sample variance of the returns / n.
+
+        Args:
+            z (float): Standard normal quantile (1.96 for 95%)
+
+        Returns:
+            tuple: (lower, upper), shape (n_states,), NaN for states visited in fewer than 2 episodes
+        """
+        n = self.episode_counts.astype(float)
+        counts = self.visit_counts.astype(float)
+        valid = n > 1
+        means = np.divide(self.returns_sum, counts, out=np.zeros_like(counts), where=valid)
+        residuals = self.returns_sq_sum - 2 * means * self.returns_visits_sum + means ** 2 * self.visits_sq_sum
+        variances = np.divide(np.maximum(residuals, 0) * n, (n - 1) * counts ** 2,
+                              out=np.zeros_like(counts), where=valid)
+        half_widths = np.where(valid, z * np.sqrt(variances), np.nan)
+        return means - half_widths, means + half_widths
+
+    @property
+    def episodes_per_second(self) -> float:
+        """Sampling throughput over all evaluation steps."""
+        return self.episodes / self.sampling_time if self.sampling_time > 0 else 0.0
+
+    def policy_improvement_step(self) -> bool:
+        """
+        The evaluated policy is fixed.
+
+        Returns:
+            bool: Always True
+        """
+        return True
+
+    def step(self, theta: float = 1e-6) -> bool:
+        """
+        Single evaluation step.
+
+        Args:
+            theta (float): Convergence threshold on the value change
+
+        Returns:
+            bool: Whether the value change dropped below theta
+        """
+        return self.policy_evaluation_step() < theta
+
+    def __str__(self) -> str:
+        return f"{'First' if self.first_visit else 'Every'}-Visit Monte Carlo"
+
+    def select_action(self, state: int) -> int:
+        """
+        Select action according to the evaluated policy.
+
+        Args:
+            state (int): Current state
+
+        Returns:
+            int: Selected action
+        """
+        return self.select_policy_action(state)
+
+    def select_actions(self, states: np.ndarray) -> np.ndarray:
+        """
+        Select actions according to current policy for many states.
+
+        Args:
+            states (np.ndarray): Current states
+
+        Returns:
+            np.ndarray: Selected actions
+        """
+        return self.select_policy_actions(states)
+
+
+class BatchedValueIteration:
+    """
+    Value Iteration over K configurations of the same GridWorld at once.
+
+    Each configuration has its own discount factor, main transition probability
+    and reward layout; walls and terminal states come from the shared env.
+    Values are stacked into a (K, n_states) array and all configurations are
+    backed up together.
+    """
+
+    __slots__ = ('env', 'gammas', 'main_transition_probs', 'rewards', 'successor_probs', 'updatable',
+                 'values', 'q_values', 'policy', 'sweeps')
+
+    def __init__(self, env: GridWorld, gammas, main_transition_probs=None, rewards=None):
+        """
+        Initialize the batched planner.
+
+        Args:
+            env (GridWorld): Environment providing the grid layout
+            gammas (array-like): Discount factor of each configuration, shape (K,)
+            main_transition_probs (array-like): Main transition probability of each
+                configuration, shape (K,) (default: env.main_transition_prob)
+            rewards (array-like): Reward layout of each configuration, shape (K, n_states)
+                (default: env.rewards)
+        """
+        self.env = env
+        self.gammas = np.asarray(gammas, dtype=float)
+        n_configs = len(self.gammas)
+
+        if main_transition_probs is None:
+            main_transition_probs = np.full(n_configs, env.main_transition_prob)
+        self.main_transition_probs = np.asarray(main_transition_probs, dtype=float)
+
+        if rewards is None:
+            rewards = np.broadcast_to(env.rewards, (n_configs, env.n_states))
+        self.rewards = np.asarray(rewards, dtype=float)
+
+        if self.main_transition_probs.shape != (n_configs,) or self.rewards.shape != (n_configs, env.n_states):
+            raise ValueError("gammas, main_transition_probs and rewards must describe the same configurations")
+
+        # Successor probabilities per configuration, shape (K, n_states, n_actions, 3)
+        self.successor_probs = np.stack([env.successor_probs_for(p) for p in self.main_transition_probs])
+        self.updatable = ~(env.terminal_mask | env.wall_mask)
+        self.reset()
+
+    @property
+    def n_configs(self) -> int:
+        return len(self.gammas)
+
+    def reset(self) -> None:
+        """
+        Reset values, Q-values and policies of all configurations.
+        """
+        n_actions = len(self.env.actions)
+        self.values = np.zeros((self.n_configs, self.env.n_states))
+        self.q_values = np.zeros((self.n_configs, self.env.n_states, n_actions))
+        self.policy = np.full((self.n_configs, self.env.n_states, n_actions), 1.0 / n_actions)
+        self.sweeps = 0
+
+    def bellman_backup(self, values: np.ndarray, configs=slice(None)) -> np.ndarray:
+        """
+        Compute Q-values of the selected configurations.
+
+        Args:
+            values (np.ndarray): State values of the selected configurations, shape (k, n_states)
+            configs (slice | np.ndarray): Selected configurations (default: all)
+
+        Returns:
+            np.ndarray: Q-values, shape (k, n_states, n_actions)
+        """
+        targets = self.rewards[configs] + self.gammas[configs, None] * values
+        return np.sum(self.successor_probs[configs] * targets[:, self.env.successors], axis=3)
+
+    def policy_evaluation_step(self, configs=slice(None)) -> np.ndarray:
+        """
+        Perform a single value iteration step for the selected configurations.
+
+        Args:
+            configs (slice | np.ndarray): Selected configurations (default: all)
+
+        Returns:
+            np.ndarray: Maximum value change of each selected configuration, shape (k,)
+        """
+        values = self.values[configs]
+        q_values = self.bellman_backup(values, configs)
+        new_values = np.max(q_values, axis=2)
+
+        mask = self.updatable
+        delta = np.max(np.abs(new_values - values), axis=1, where=mask, initial=0.0)
+
+        q_values[:, ~mask] = self.q_values[configs][:, ~mask]
+        new_values[:, ~mask] = values[:, ~mask]
+        self.q_values[configs] = q_values
+        self.values[configs] = new_values
+        self.sweeps += 1
+        return delta
+
+    def policy_improvement_step(self) -> None:
+        """
+        Make the policy of every configuration greedy with respect to its Q-values.
+        Terminal states keep their policy.
+        """
+        best_actions = np.argmax(self.q_values, axis=2)
+        n_actions = len(self.env.actions)
+        greedy = np.eye(n_actions)[best_actions]
+        self.policy[:, ~self.env.terminal_mask] = greedy[:, ~self.env.terminal_mask]
+
+    def run(self, theta: float = 1e-6, max_steps: int = 1000) -> None:
+        """
+        Iterate until every configuration has converged, then extract greedy policies.
+
+        Args:
+            theta (float): Convergence threshold on the value change
+            max_steps (int): Maximum number of iteration steps
+        """
+        # Configurations that have not converged yet, converged ones are no longer backed up
+        active = np.arange(self.n_configs)
+        for _ in range(max_steps):
+            delta = self.policy_evaluation_step(active)
+            active = active[delta >= theta]
+            if active.size == 0:
+                break
+        self.policy_improvement_step()
+
+    def results(self) -> List[dict]:
+        """
+        Unpack the batched tables into one dict per configuration.
+
+        Returns:
+            List[dict]: Keys gamma, main_transition_prob, values, q_values, policy
+        """
+        return [
+            {
+                'gamma': float(self.gammas[k]),
+                'main_transition_prob': float(self.main_transition_probs[k]),
+                'values': self.values[k].copy(),
+                'q_values': self.q_values[k].copy(),
+                'policy': self.policy[k].copy(),
+            }
+            for k in range(self.n_configs)
+        ]
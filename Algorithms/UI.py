@@ -1,7 +1,8 @@
 import pygame
 import numpy as np
 import sys
-from RLAlgorithms import PolicyIteration, ValueIteration  # , QLearning
+import time
+from RLAlgorithms import PolicyIteration, ValueIteration, TemporalDifferenceLearning
 
 
 class GridWorldViz:
@@ -17,7 +18,8 @@ class GridWorldViz:
         self.BLUE = (0, 0, 255)
 
         # Display settings
-        self.CELL_SIZE = 125
+        # Cells shrink on large grids so that the grid still fits the window
+        self.CELL_SIZE = max(10, min(125, 875 // env.size))
 
         self.env = env
         self.font = pygame.font.Font(None, 24)
@@ -130,47 +132,186 @@ class GridWorldViz:
         ]
 
         # Screen
-        self.WINDOW_SIZE = (self.viz_sec_right_edge, env.size * self.CELL_SIZE)
+        self.WINDOW_SIZE = (self.viz_sec_right_edge, max(env.size * self.CELL_SIZE, 875))
         self.screen = pygame.display.set_mode(self.WINDOW_SIZE)
         pygame.display.set_caption("GridWorld Visualization")
+        self.panel_rect = pygame.Rect(self.algo_sec_left, 0, self.WINDOW_SIZE[0] - self.algo_sec_left,
+                                      self.WINDOW_SIZE[1])
+
+        # Rendered text surfaces, keyed by (text, color)
+        self.text_cache = {}
+        # Cell backgrounds/walls, with and without rewards, rendered once
+        self.build_static_layers()
+
+        # What is on screen (see cell_contents), so that only changed cells are redrawn
+        self.drawn = None
+        self.full_redraw = True
+        self.panel_dirty = True
+        # Duration of the last redraw in seconds, shown in the window caption
+        self.frame_time = 0.0
+        self.clock = pygame.time.Clock()
 
     def run(self):
-        """Main visualization loop."""
+        """Main visualization loop, redrawing only after events."""
+        # Mouse motion would wake the loop up without changing anything
+        pygame.event.set_blocked(pygame.MOUSEMOTION)
         running = True
+        self.redraw()
         while running:
-            for event in pygame.event.get():
+            # Block until an event arrives instead of redrawing continuously
+            for event in [pygame.event.wait()] + pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     pos = pygame.mouse.get_pos()
                     self.handle_click(pos)
+                    self.panel_dirty = True
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.full_redraw = True
 
-            self.screen.fill(self.WHITE)
-            self.draw_grid()
-            self.draw_agent()
-            self.draw_algo_sec()
-            self.draw_viz_sec()
-            self.draw_algo_cont_sec()
-            self.draw_agent_sec()
-            pygame.display.flip()
+            if running:
+                self.redraw()
+                # Cap bursts of events at 60 frames per second
+                self.clock.tick(60)
 
         pygame.quit()
 
-    def draw_grid(self):
-        """Draw the grid and current state values."""
-        for i in range(self.env.size):
-            for j in range(self.env.size):
-                rect = pygame.Rect(j * self.CELL_SIZE, i * self.CELL_SIZE,
-                                   self.CELL_SIZE, self.CELL_SIZE)
-
-                s = self.env.index_to_state(i, j)
-                self.draw_cell_background(rect, s)
-                self.draw_rewards(rect, s)
-                self.draw_state_values(rect, s)
-                self.draw_action_values(rect, s)
-                self.draw_policy_arrows(rect, s)
-
-    def draw_cell_background(self, rect, s):
+    def redraw(self):
+        """Redraw the changed cells, and the side panel if needed, and update only those regions."""
+        start = time.perf_counter()
+        contents = self.cell_contents()
+
+        if self.full_redraw:
+            self.screen.fill(self.WHITE)
+            rects = self.draw_grid() + self.draw_panel()
+        else:
+            rects = self.draw_grid(self.dirty_states(contents))
+            if self.panel_dirty:
+                rects += self.draw_panel()
+        self.drawn = contents
+
+        if not rects:
+            return
+        if self.full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        self.full_redraw = False
+
+        self.frame_time = time.perf_counter() - start
+        pygame.display.set_caption(f"GridWorld Visualization ({self.frame_time * 1e3:.1f} ms/frame)")
+
+    def render_text(self, text, color=None):
+        """Render text with self.font, reusing the surface of text rendered before."""
+        key = (text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            # Values change continuously, so keep the cache bounded
+            if len(self.text_cache) > 10000:
+                self.text_cache.clear()
+            surface = self.font.render(text, True, self.BLACK if color is None else color)
+            self.text_cache[key] = surface
+        return surface
+
+    def cell_rect(self, s):
+        """Screen rect of the cell of state s."""
+        i, j = self.env.state_to_index(s)
+        return pygame.Rect(j * self.CELL_SIZE, i * self.CELL_SIZE, self.CELL_SIZE, self.CELL_SIZE)
+
+    def build_static_layers(self):
+        """Render the parts of the grid that never change: cell backgrounds/walls and rewards."""
+        size = self.env.size * self.CELL_SIZE
+        self.background = pygame.Surface((size, size))
+        for s in range(self.env.n_states):
+            self.draw_cell_background(self.background, self.cell_rect(s), s)
+
+        self.reward_layer = self.background.copy()
+        for s in range(self.env.n_states):
+            self.draw_rewards(self.reward_layer, self.cell_rect(s), s)
+
+    def cell_contents(self):
+        """Snapshot of everything the cells show, compared between frames by dirty_states."""
+        alg = self.current_alg
+        contents = {
+            'config': (id(alg), self.show_rewards, self.show_state_values,
+                       self.show_action_values, self.show_policy),
+            'agent': self.env.agent_state,
+            'highlight': None,
+        }
+        if alg is not None:
+            if self.show_state_values:
+                contents['values'] = alg.values.copy()
+            if self.show_action_values:
+                contents['q_values'] = alg.q_values.copy()
+            if self.show_policy:
+                # In compact mode compare the int8 actions instead of materializing the (S, A) table
+                contents['policy'] = alg.policy_actions.copy() if alg.compact else alg.policy.copy()
+                if len(self.env.agent_trace) >= 2:
+                    contents['highlight'] = (self.env.agent_trace[-2], self.selected_action)
+        return contents
+
+    def dirty_states(self, contents):
+        """States whose cells differ from what is on screen."""
+        if self.drawn is None or contents['config'] != self.drawn['config']:
+            return np.arange(self.env.n_states)
+
+        dirty = np.zeros(self.env.n_states, dtype=bool)
+        for key in ('values', 'q_values', 'policy'):
+            if key in contents:
+                changed = contents[key] != self.drawn[key]
+                dirty |= changed.reshape(self.env.n_states, -1).any(axis=1)
+
+        if contents['agent'] != self.drawn['agent']:
+            dirty[[contents['agent'], self.drawn['agent']]] = True
+        if contents['highlight'] != self.drawn['highlight']:
+            for highlight in (contents['highlight'], self.drawn['highlight']):
+                if highlight is not None and highlight[0] is not None:
+                    dirty[highlight[0]] = True
+        return np.flatnonzero(dirty)
+
+    def draw_grid(self, states=None):
+        """
+        Draw the cells of the given states (default: all) over the cached static layer.
+
+        Returns:
+            list: Screen rects of the drawn cells
+        """
+        layer = self.reward_layer if self.show_rewards else self.background
+        if states is None:
+            states = range(self.env.n_states)
+
+        rects = []
+        for s in states:
+            s = int(s)
+            rect = self.cell_rect(s)
+            self.screen.blit(layer, rect, rect)
+            # Keep arrows and text inside the cell so that neighbours stay intact
+            self.screen.set_clip(rect)
+            self.draw_state_values(rect, s)
+            self.draw_action_values(rect, s)
+            self.draw_policy_arrows(rect, s)
+            if s == self.env.agent_state:
+                self.draw_agent()
+            self.screen.set_clip(None)
+            rects.append(rect)
+        return rects
+
+    def draw_panel(self):
+        """
+        Draw the side panel with all button sections.
+
+        Returns:
+            list: Screen rect of the panel
+        """
+        self.screen.fill(self.WHITE, self.panel_rect)
+        self.draw_algo_sec()
+        self.draw_viz_sec()
+        self.draw_algo_cont_sec()
+        self.draw_agent_sec()
+        self.panel_dirty = False
+        return [self.panel_rect]
+
+    def draw_cell_background(self, surface, rect, s):
         """Draw the background of a cell."""
         if s in self.env.terminal_states:
             color = self.GREEN if self.env.rewards[s] > 0 else self.RED
@@ -180,21 +321,20 @@ class GridWorldViz:
             color = self.RED
         else:
             color = self.WHITE
-        pygame.draw.rect(self.screen, color, rect)
-        pygame.draw.rect(self.screen, self.BLACK, rect, 1)
+        pygame.draw.rect(surface, color, rect)
+        pygame.draw.rect(surface, self.BLACK, rect, 1)
 
-    def draw_rewards(self, rect, s):
-        """Draw rewards in a cell if enabled."""
-        if self.show_rewards:
-            text = self.font.render(f'{self.env.rewards[s]:.1f}', True, self.BLACK)
-            text_rect = text.get_rect(center=rect.center)
-            self.screen.blit(text, text_rect)
+    def draw_rewards(self, surface, rect, s):
+        """Draw the reward of a cell."""
+        text = self.render_text(f'{self.env.rewards[s]:.1f}')
+        text_rect = text.get_rect(center=rect.center)
+        surface.blit(text, text_rect)
 
     def draw_state_values(self, rect, s):
         """Draw state values in a cell if enabled."""
         if self.current_alg is not None and self.show_state_values:
             v_s = self.current_alg.values[s]
-            text = self.font.render(f'{v_s:.2f}', True, self.BLACK)
+            text = self.render_text(f'{v_s:.2f}')
             text_rect = text.get_rect(center=rect.center)
             self.screen.blit(text, text_rect)
 
@@ -203,7 +343,7 @@ class GridWorldViz:
         if self.current_alg is not None and self.show_action_values:
             for a in self.env.actions:
                 q_sa = self.current_alg.q_values[s, a]
-                text = self.font.render(f'{q_sa:.2f}', True, self.BLACK)
+                text = self.render_text(f'{q_sa:.2f}')
                 if a == 0:
                     text_rect = text.get_rect(midtop=rect.midtop)
                 elif a == 1:
@@ -217,11 +357,11 @@ class GridWorldViz:
     def draw_policy_arrows(self, rect, s):
         """Draw policy arrows in a cell if enabled."""
         if self.current_alg is not None and self.show_policy:
-            policy_probs = self.current_alg.policy[s]
+            policy_probs = self.current_alg.policy_probs(s)
             for a, prob in enumerate(policy_probs):
                 if prob > 0:
                     start_pos, end_pos = self.get_arrow_positions(rect, a)
-                    color = self.RED if s == self.env.agent_trace[-2] and a == self.selected_action else self.BLACK
+                    color = self.RED if len(self.env.agent_trace) >= 2 and s == self.env.agent_trace[-2] and a == self.selected_action else self.BLACK
                     self.draw_arrow(a, start_pos, end_pos, color)
 
     def get_arrow_positions(self, rect, a):
@@ -270,7 +410,7 @@ class GridWorldViz:
     def draw_algo_sec(self):
         """Draw algorithm selection section."""
         pygame.draw.rect(self.screen, self.WHITE, self.algo_sec_title['rect'])
-        text = self.font.render(self.algo_sec_title['text'], True, self.BLACK)
+        text = self.render_text(self.algo_sec_title['text'])
         text_rect = text.get_rect(center=self.algo_sec_title['rect'].center)
         self.screen.blit(text, text_rect)
         # Draw left edge
@@ -286,7 +426,7 @@ class GridWorldViz:
                 color = self.WHITE
             pygame.draw.rect(self.screen, color, button['rect'])
             pygame.draw.rect(self.screen, self.BLACK, button['rect'], 1)
-            text = self.font.render(button['text'], True, self.BLACK)
+            text = self.render_text(button['text'])
             text_rect = text.get_rect(center=button['rect'].center)
             self.screen.blit(text, text_rect)
 
@@ -298,7 +438,7 @@ class GridWorldViz:
 
         # Draw title
         pygame.draw.rect(self.screen, self.WHITE, self.viz_sec_title['rect'])
-        text = self.font.render(self.viz_sec_title['text'], True, self.BLACK)
+        text = self.render_text(self.viz_sec_title['text'])
         text_rect = text.get_rect(center=self.viz_sec_title['rect'].center)
         self.screen.blit(text, text_rect)
 
@@ -311,7 +451,7 @@ class GridWorldViz:
             color = self.GREEN if button['state'] else self.WHITE
             pygame.draw.rect(self.screen, color, button['rect'])
             pygame.draw.rect(self.screen, self.BLACK, button['rect'], 1)
-            text = self.font.render(button['text'], True, self.BLACK)
+            text = self.render_text(button['text'])
             text_rect = text.get_rect(center=button['rect'].center)
             self.screen.blit(text, text_rect)
 
@@ -326,14 +466,14 @@ class GridWorldViz:
         """Draw algorithm control section."""
         # Draw title
         pygame.draw.rect(self.screen, self.WHITE, self.cont_sec_title['rect'])
-        text = self.font.render(self.cont_sec_title['text'], True, self.BLACK)
+        text = self.render_text(self.cont_sec_title['text'])
         text_rect = text.get_rect(center=self.cont_sec_title['rect'].center)
         self.screen.blit(text, text_rect)
 
         # Draw steps and buttons w.r.t. current algorithm
         if isinstance(self.current_alg, PolicyIteration):
             self._draw_policy_iteration_controls()
-        elif isinstance(self.current_alg, ValueIteration):
+        elif isinstance(self.current_alg, (ValueIteration, TemporalDifferenceLearning)):
             self._draw_value_iteration_controls()
         else:
             # Draw nothing if no algorithm is selected
@@ -346,12 +486,12 @@ class GridWorldViz:
     def _draw_policy_iteration_controls(self):
         # Draw steps
         self.eval_step_counter['text'] = f'Evaluation Steps: {self.evaluation_steps}'
-        text = self.font.render(self.eval_step_counter['text'], True, self.BLACK)
+        text = self.render_text(self.eval_step_counter['text'])
         text_rect = text.get_rect(center=self.eval_step_counter['rect'].center)
         self.screen.blit(text, text_rect)
 
         self.iter_step_counter['text'] = f'Iteration Steps: {self.iteration_steps}'
-        text = self.font.render(self.iter_step_counter['text'], True, self.BLACK)
+        text = self.render_text(self.iter_step_counter['text'])
         text_rect = text.get_rect(center=self.iter_step_counter['rect'].center)
         self.screen.blit(text, text_rect)
 
@@ -363,14 +503,14 @@ class GridWorldViz:
                 button['visible'] = True
                 pygame.draw.rect(self.screen, self.WHITE, button['rect'])
                 pygame.draw.rect(self.screen, self.BLACK, button['rect'], 1)
-                text = self.font.render(button['text'], True, self.BLACK)
+                text = self.render_text(button['text'])
                 text_rect = text.get_rect(center=button['rect'].center)
                 self.screen.blit(text, text_rect)
 
     def _draw_value_iteration_controls(self):
         # Draw steps
         self.iter_step_counter['text'] = f'Iteration Steps: {self.iteration_steps}'
-        text = self.font.render(self.iter_step_counter['text'], True, self.BLACK)
+        text = self.render_text(self.iter_step_counter['text'])
         text_rect = text.get_rect(center=self.iter_step_counter['rect'].center)
         self.screen.blit(text, text_rect)
 
@@ -383,7 +523,7 @@ class GridWorldViz:
 
                 pygame.draw.rect(self.screen, self.WHITE, button['rect'])
                 pygame.draw.rect(self.screen, self.BLACK, button['rect'], 1)
-                text = self.font.render(button['text'], True, self.BLACK)
+                text = self.render_text(button['text'])
                 text_rect = text.get_rect(center=button['rect'].center)
                 self.screen.blit(text, text_rect)
 
@@ -391,7 +531,7 @@ class GridWorldViz:
         """Draw agent control section."""
         # Draw title
         pygame.draw.rect(self.screen, self.WHITE, self.agent_sec_title['rect'])
-        text = self.font.render(self.agent_sec_title['text'], True, self.BLACK)
+        text = self.render_text(self.agent_sec_title['text'])
         text_rect = text.get_rect(center=self.agent_sec_title['rect'].center)
         self.screen.blit(text, text_rect)
 
@@ -399,7 +539,7 @@ class GridWorldViz:
         for i, button in enumerate(self.agent_control_buttons):
             pygame.draw.rect(self.screen, self.WHITE, button['rect'])
             pygame.draw.rect(self.screen, self.BLACK, button['rect'], 1)
-            text = self.font.render(button['text'], True, self.BLACK)
+            text = self.render_text(button['text'])
             text_rect = text.get_rect(center=button['rect'].center)
             self.screen.blit(text, text_rect)
 
@@ -546,3 +686,5 @@ class GridWorldViz:
         self.screen.blit(toast_text, toast_rect)
         pygame.display.flip()
         pygame.time.delay(duration)
+        # The toast covers the grid and the panel
+        self.full_redraw = True
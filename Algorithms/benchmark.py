@@ -0,0 +1,134 @@
+import argparse
+import time
+from GridWorld import GridWorld
+import numpy as np
+from RLAlgorithms import (PolicyIteration, ValueIteration, GaussSeidelValueIteration,
+                          PrioritizedSweepingValueIteration, MonteCarloPolicyEvaluation)
+
+
+def bench_construction(size, repeats=3):
+    """
+    Measure GridWorld construction time.
+
+    Args:
+        size (int): Grid size
+        repeats (int): Number of constructions, the best time is reported
+
+    Returns:
+        float: Best construction time in seconds
+    """
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        GridWorld(size=size)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_convergence(algorithm, theta=1e-6, max_sweeps=100000):
+    """
+    Run policy evaluation steps until the value change drops below theta.
+
+    Args:
+        algorithm (GeneralizedPolicyIteration): Algorithm to run (freshly reset)
+        theta (float): Convergence threshold
+        max_sweeps (int): Maximum number of evaluation steps
+
+    Returns:
+        float: Wall-clock time in seconds
+    """
+    start = time.perf_counter()
+    for _ in range(max_sweeps):
+        if algorithm.policy_evaluation_step() < theta:
+            break
+    return time.perf_counter() - start
+
+
+def bench_policy_improvement(size, repeats=5):
+    """
+    Measure greedy policy improvement on random Q-values.
+
+    Args:
+        size (int): Grid size (n_states = size ** 2)
+        repeats (int): Number of improvements, the best time is reported
+
+    Returns:
+        float: Best improvement time in seconds
+    """
+    algorithm = PolicyIteration(GridWorld(size=size))
+    rng = np.random.default_rng(0)
+    best = float('inf')
+    for _ in range(repeats):
+        algorithm.q_values[:] = rng.random(algorithm.q_values.shape)
+        start = time.perf_counter()
+        algorithm.greedy_policy_improvement()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_monte_carlo(size, gamma=0.95, n_episodes=10000, first_visit=True):
+    """
+    Evaluate the uniform random policy by Monte Carlo and compare with the exact values.
+
+    Args:
+        size (int): Grid size
+        gamma (float): Discount factor
+        n_episodes (int): Number of sampled episodes
+        first_visit (bool): First-visit or every-visit estimates
+
+    Returns:
+        tuple: (algorithm, fraction of estimated states whose 95% interval contains the exact value)
+    """
+    env = GridWorld(size=size)
+    exact = PolicyIteration(env, gamma=gamma, evaluation='exact')
+    exact.exact_policy_evaluation()
+
+    algorithm = MonteCarloPolicyEvaluation(env, gamma=gamma, first_visit=first_visit,
+                                           n_episodes=n_episodes)
+    algorithm.policy_evaluation_step()
+    lower, upper = algorithm.confidence_intervals()
+    estimated = ~np.isnan(lower)
+    covered = (lower <= exact.values) & (exact.values <= upper)
+    return algorithm, covered[estimated].mean()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GridWorld and RLAlgorithms.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[7, 50, 200, 500],
+                        help="Grid sizes to benchmark.")
+    parser.add_argument("--convergence-sizes", type=int, nargs="+", default=[7, 30, 50],
+                        help="Grid sizes for the value iteration convergence comparison.")
+    parser.add_argument("--gamma", type=float, default=0.95, help="Discount factor.")
+    parser.add_argument("--improvement-sizes", type=int, nargs="+", default=[100, 316, 1000],
+                        help="Grid sizes for the greedy policy improvement benchmark.")
+    parser.add_argument("--mc-sizes", type=int, nargs="+", default=[7, 30],
+                        help="Grid sizes for the Monte Carlo evaluation benchmark.")
+    args = parser.parse_args()
+
+    print("GridWorld construction")
+    for size in args.sizes:
+        print(f"  size {size:>4} ({size * size:>7} states): {bench_construction(size) * 1e3:9.2f} ms")
+
+    print("Greedy policy improvement")
+    for size in args.improvement_sizes:
+        print(f"  size {size:>4} ({size * size:>7} states): {bench_policy_improvement(size) * 1e3:9.2f} ms")
+
+    print("Value iteration convergence")
+    for size in args.convergence_sizes:
+        env = GridWorld(size=size)
+        for cls in [ValueIteration, GaussSeidelValueIteration, PrioritizedSweepingValueIteration]:
+            algorithm = cls(env, gamma=args.gamma)
+            elapsed = bench_convergence(algorithm)
+            print(f"  size {size:>4} {str(algorithm):<30} sweeps {algorithm.sweeps:>6} "
+                  f"backups {algorithm.backups:>9} time {elapsed * 1e3:9.2f} ms")
+
+    print("Monte Carlo evaluation of the uniform policy")
+    for size in args.mc_sizes:
+        for first_visit in [True, False]:
+            algorithm, coverage = bench_monte_carlo(size, args.gamma, first_visit=first_visit)
+            print(f"  size {size:>4} {str(algorithm):<30} {algorithm.episodes_per_second:>10,.0f} episodes/s "
+                  f"95% CI coverage {coverage:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
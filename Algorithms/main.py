@@ -1,7 +1,8 @@
 import numpy as np
 import pygame
 from GridWorld import GridWorld
-from RLAlgorithms import PolicyIteration, ValueIteration  # , QLearning
+from RLAlgorithms import (PolicyIteration, ValueIteration, GaussSeidelValueIteration,
+                          PrioritizedSweepingValueIteration, QLearning, SARSA)
 from UI import GridWorldViz
 
 
@@ -13,7 +14,10 @@ def main(seed=42):
     algorithms = [
         PolicyIteration(env, gamma=0.9, seed=seed),
         ValueIteration(env, gamma=0.9, seed=seed),
-        # 'q_learning': QLearning(env, gamma=0.9, alpha=0.1, epsilon=0.1, seed=seed)
+        GaussSeidelValueIteration(env, gamma=0.9, seed=seed),
+        PrioritizedSweepingValueIteration(env, gamma=0.9, seed=seed),
+        QLearning(env, gamma=0.9, alpha=0.1, epsilon=0.1, seed=seed),
+        SARSA(env, gamma=0.9, alpha=0.1, epsilon=0.1, seed=seed),
     ]
 
     # Create and run visualization
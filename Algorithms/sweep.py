@@ -0,0 +1,153 @@
+import argparse
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+
+import numpy as np
+from GridWorld import GridWorld
+from RLAlgorithms import (PolicyIteration, ValueIteration, GaussSeidelValueIteration,
+                          PrioritizedSweepingValueIteration)
+
+# Algorithms available to the sweep, by name
+ALGORITHMS = {
+    'pi': PolicyIteration,
+    'pi-modified': partial(PolicyIteration, evaluation='modified'),
+    'pi-exact': partial(PolicyIteration, evaluation='exact'),
+    'vi': ValueIteration,
+    'gs-vi': GaussSeidelValueIteration,
+    'ps-vi': PrioritizedSweepingValueIteration,
+}
+
+# Shared transition arrays attached in each worker process: {size: (blocks, arrays)}
+_shared_envs = {}
+
+
+def share_transition_arrays(sizes):
+    """
+    Build the transition model of each grid size once and copy it into shared memory.
+
+    Args:
+        sizes (list): Grid sizes
+
+    Returns:
+        tuple: (blocks, specs) where blocks are the SharedMemory objects to unlink
+            afterwards and specs[size][name] = (shm name, shape, dtype str)
+    """
+    blocks, specs = [], {}
+    for size in sizes:
+        env = GridWorld(size=size)
+        specs[size] = {}
+        for name in GridWorld.TRANSITION_ARRAYS:
+            array = getattr(env, name)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            blocks.append(shm)
+            specs[size][name] = (shm.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def attach_transition_arrays(specs):
+    """
+    Worker initializer: attach to the shared transition arrays (read-only views).
+
+    Args:
+        specs (dict): Output of share_transition_arrays
+    """
+    for size, arrays in specs.items():
+        blocks, views = [], {}
+        for name, (shm_name, shape, dtype) in arrays.items():
+            shm = shared_memory.SharedMemory(name=shm_name)
+            view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+            view.flags.writeable = False
+            blocks.append(shm)
+            views[name] = view
+        _shared_envs[size] = (blocks, views)
+
+
+def run_config(config):
+    """
+    Run one configuration until the policy is stable and the values have converged.
+
+    Args:
+        config (dict): Keys algorithm, size, seed, gamma, theta, max_steps
+
+    Returns:
+        dict: Convergence metrics of the run
+    """
+    _, arrays = _shared_envs[config['size']]
+    env = GridWorld(size=config['size'], seed=config['seed'], transition_arrays=arrays)
+    algorithm = ALGORITHMS[config['algorithm']](env, gamma=config['gamma'], seed=config['seed'])
+
+    start = time.perf_counter()
+    delta, converged, steps = float('inf'), False, 0
+    for steps in range(1, config['max_steps'] + 1):
+        delta = algorithm.policy_evaluation_step()
+        if algorithm.policy_improvement_step() and delta < config['theta']:
+            converged = True
+            break
+    wall_time = time.perf_counter() - start
+
+    return {
+        **config,
+        'steps': steps,
+        'sweeps': algorithm.sweeps,
+        'backups': algorithm.backups,
+        'wall_time': wall_time,
+        'final_delta': delta,
+        'converged': converged,
+    }
+
+
+def run_sweep(configs, max_workers=None):
+    """
+    Run all configurations over a process pool sharing the transition arrays.
+
+    Args:
+        configs (list): Configurations for run_config
+        max_workers (int): Number of worker processes (default: CPU count)
+
+    Returns:
+        dict: Column name -> np.ndarray, one row per configuration
+    """
+    blocks, specs = share_transition_arrays(sorted({config['size'] for config in configs}))
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=attach_transition_arrays,
+                                 initargs=(specs,)) as executor:
+            rows = list(executor.map(run_config, configs))
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    return {key: np.array([row[key] for row in rows]) for key in rows[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a hyperparameter sweep over RLAlgorithms headlessly.")
+    parser.add_argument("--algorithms", nargs="+", default=['pi', 'vi'], choices=sorted(ALGORITHMS),
+                        help="Algorithms to run.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[7], help="Grid sizes.")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[42], help="Random seeds.")
+    parser.add_argument("--gammas", type=float, nargs="+", default=[0.9], help="Discount factors.")
+    parser.add_argument("--theta", type=float, default=1e-6, help="Convergence threshold.")
+    parser.add_argument("--max-steps", type=int, default=1000, help="Maximum iteration steps per run.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--output", type=str, default="sweep_results.npz", help="Output .npz file.")
+    args = parser.parse_args()
+
+    configs = [
+        {'algorithm': algorithm, 'size': size, 'seed': seed, 'gamma': gamma,
+         'theta': args.theta, 'max_steps': args.max_steps}
+        for algorithm, size, seed, gamma in itertools.product(args.algorithms, args.sizes, args.seeds, args.gammas)
+    ]
+
+    start = time.perf_counter()
+    results = run_sweep(configs, args.workers)
+    np.savez_compressed(args.output, **results)
+    print(f"{len(configs)} runs in {time.perf_counter() - start:.2f}s, results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
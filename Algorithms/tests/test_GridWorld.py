@@ -0,0 +1,34 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from GridWorld import GridWorld  # noqa: E402
+
+
+def test_successor_probs_are_stochastic():
+    for compact in (False, True):
+        env = GridWorld(size=7, compact=compact)
+        np.testing.assert_allclose(env.successor_probs.sum(axis=-1), 1.0, rtol=1e-6)
+        np.testing.assert_allclose(env.dense_transition_probs().sum(axis=-1), 1.0, rtol=1e-6)
+
+
+def test_sample_next_states_matches_model():
+    env = GridWorld(size=7)
+    n_samples = 20000
+    rng = np.random.RandomState(0)
+    model = env.dense_transition_probs()
+
+    # Sample n_samples agents for every (s, a) pair at once
+    states, actions = np.divmod(np.arange(env.n_states * len(env.actions)), len(env.actions))
+    states, actions = np.repeat(states, n_samples), np.repeat(actions, n_samples)
+    next_states = env.sample_next_states(states, actions, rng)
+
+    pairs = states * len(env.actions) + actions
+    counts = np.zeros((env.n_states * len(env.actions), env.n_states))
+    np.add.at(counts, (pairs, next_states), 1)
+    frequencies = counts.reshape(model.shape) / n_samples
+
+    # The standard error is about 0.003 at p = 0.8, allow 5 standard errors
+    assert np.abs(frequencies - model).max() < 0.015
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from GridWorld import GridWorld  # noqa: E402
+from RLAlgorithms import MonteCarloPolicyEvaluation, PolicyIteration  # noqa: E402
+
+
+def monte_carlo_coverage(first_visit, size=5, gamma=0.9, n_seeds=10):
+    """Fraction of the 95% intervals that contain the exact values of the GridWorld model, averaged over seeds."""
+    exact = PolicyIteration(GridWorld(size=size), gamma=gamma, evaluation='exact')
+    exact.exact_policy_evaluation()
+
+    coverage = []
+    for seed in range(n_seeds):
+        algorithm = MonteCarloPolicyEvaluation(GridWorld(size=size), gamma=gamma, seed=seed,
+                                               first_visit=first_visit, n_episodes=2000)
+        algorithm.policy_evaluation_step()
+        lower, upper = algorithm.confidence_intervals()
+        estimated = ~np.isnan(lower)
+        coverage.append(((lower <= exact.values) & (exact.values <= upper))[estimated].mean())
+    return np.mean(coverage)
+
+
+def test_first_visit_intervals_cover_exact_values():
+    assert monte_carlo_coverage(first_visit=True) > 0.9
+
+
+def test_every_visit_intervals_cover_exact_values():
+    assert monte_carlo_coverage(first_visit=False) > 0.9
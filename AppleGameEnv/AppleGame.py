@@ -1,5 +1,136 @@
 import numpy as np
-import random
+
+
+def spawn_rngs(seed, num_envs):
+    """ 하나의 seed로부터 서로 독립된 N개의 난수 생성기를 만듦
+
+    Args:
+        seed (int | np.random.SeedSequence | None): 기준 seed (None이면 OS 엔트로피 사용)
+        num_envs (int): 만들 난수 생성기의 수
+
+    Returns:
+        rngs (list[np.random.Generator]): 게임판마다 하나씩 쓰는 난수 생성기
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in seed.spawn(num_envs)]
+
+
+def generate_boards(rngs, m, n, out=None):
+    """ 각 난수 생성기로 게임판을 하나씩 생성하여 (N, 1, m, n) 배열에 채움
+
+    i번째 게임판은 rngs[i]만 사용하므로, 같은 생성기로 AppleGame.reset을 했을 때와 같은 게임판이 됨
+
+    Args:
+        rngs (list[np.random.Generator]): 게임판마다 하나씩 쓰는 난수 생성기
+        m (int): 게임판의 행 수
+        n (int): 게임판의 열 수
+        out (np.ndarray, optional): 결과를 기록할 (N, 1, m, n) uint8 배열
+
+    Returns:
+        out (np.ndarray): (N, 1, m, n) 게임판
+    """
+    if out is None:
+        out = np.empty((len(rngs), 1, m, n), dtype=np.uint8)
+    for board, rng in zip(out, rngs):
+        board[...] = rng.integers(1, 10, size=(1, m, n), dtype=np.uint8)
+    return out
+
+
+def enumerate_rects(m, n):
+    """ m x n 게임판에서 만들 수 있는 모든 사각형을 정해진 순서로 나열
+
+    사각형은 (x1, y1, x2, y2) (x1 <= x2, y1 <= y2) 형태이며,
+    행 쌍 (x1, x2)의 인덱스 * 열 쌍의 수 + 열 쌍 (y1, y2)의 인덱스 순서로 나열됨
+
+    Args:
+        m (int): 게임판의 행 수
+        n (int): 게임판의 열 수
+
+    Returns:
+        rects (np.ndarray): (R, 4) 사각형 좌표, R = m(m+1)/2 * n(n+1)/2
+        row_pairs (np.ndarray): (2, m(m+1)/2) 행 쌍 (x1, x2)
+        col_pairs (np.ndarray): (2, n(n+1)/2) 열 쌍 (y1, y2)
+    """
+    row_pairs = np.stack(np.triu_indices(m)).astype(np.int16)
+    col_pairs = np.stack(np.triu_indices(n)).astype(np.int16)
+
+    rects = np.empty((row_pairs.shape[1], col_pairs.shape[1], 4), dtype=np.int16)
+    rects[..., 0] = row_pairs[0][:, None]
+    rects[..., 1] = col_pairs[0][None, :]
+    rects[..., 2] = row_pairs[1][:, None]
+    rects[..., 3] = col_pairs[1][None, :]
+    return rects.reshape(-1, 4), row_pairs, col_pairs
+
+
+# 1~9 숫자의 5x7 비트맵 (rgb_array 렌더링에 사용)
+DIGIT_GLYPHS = {
+    1: ["..#..", ".##..", "..#..", "..#..", "..#..", "..#..", ".###."],
+    2: [".###.", "#...#", "....#", "...#.", "..#..", ".#...", "#####"],
+    3: ["#####", "...#.", "..#..", "...#.", "....#", "#...#", ".###."],
+    4: ["...#.", "..##.", ".#.#.", "#..#.", "#####", "...#.", "...#."],
+    5: ["#####", "#....", "####.", "....#", "....#", "#...#", ".###."],
+    6: ["..##.", ".#...", "#....", "####.", "#...#", "#...#", ".###."],
+    7: ["#####", "....#", "...#.", "..#..", ".#...", ".#...", ".#..."],
+    8: [".###.", "#...#", "#...#", ".###.", "#...#", "#...#", ".###."],
+    9: [".###.", "#...#", "#...#", ".####", "....#", "...#.", ".##.."],
+}
+
+# 칸의 색 (UI와 같은 색): 빈 칸, 사과, 숫자, 칸 테두리
+EMPTY_COLOR = (255, 255, 255)
+APPLE_COLOR = (0, 255, 0)
+DIGIT_COLOR = (0, 0, 0)
+BORDER_COLOR = (200, 200, 200)
+
+
+def cell_tiles(cell_size=16):
+    """ 칸의 값 0~9마다 cell_size x cell_size RGB 타일을 미리 그려둔 atlas 생성
+
+    배경색 palette에 숫자 glyph를 정수 배율로 키워 가운데에 그리고, 오른쪽/아래 1px 테두리를 그림
+
+    Args:
+        cell_size (int, optional): 칸 한 변의 픽셀 수 (9 이상)
+
+    Returns:
+        tiles (np.ndarray): (10, cell_size, cell_size, 3) uint8
+    """
+    if cell_size < 9:
+        raise ValueError(f"cell_size: {cell_size}")
+    palette = np.array([EMPTY_COLOR] + [APPLE_COLOR] * 9, dtype=np.uint8)
+    tiles = np.broadcast_to(palette[:, None, None, :], (10, cell_size, cell_size, 3)).copy()
+
+    scale = max(1, (cell_size - 2) // 7)
+    height, width = 7 * scale, 5 * scale
+    top, left = (cell_size - 1 - height) // 2, (cell_size - 1 - width) // 2
+    for value, rows in DIGIT_GLYPHS.items():
+        glyph = np.array([[c == "#" for c in row] for row in rows])
+        glyph = glyph.repeat(scale, axis=0).repeat(scale, axis=1)
+        tiles[value, top:top + height, left:left + width][glyph] = DIGIT_COLOR
+
+    tiles[:, -1, :] = BORDER_COLOR
+    tiles[:, :, -1] = BORDER_COLOR
+    return tiles
+
+
+def render_boards(boards, tiles):
+    """ 게임판들을 RGB 이미지로 변환 (pygame이나 화면 없이 동작)
+
+    각 칸의 값으로 타일 atlas를 fancy indexing하고 축을 재배열하여 한 번에 이어 붙임
+
+    Args:
+        boards (np.ndarray): (..., m, n) 게임판 (예: (m, n), (1, m, n), (N, 1, m, n))
+        tiles (np.ndarray): cell_tiles가 만든 (10, c, c, 3) atlas
+
+    Returns:
+        frames (np.ndarray): (..., m * c, n * c, 3) uint8 이미지
+    """
+    boards = np.asarray(boards)
+    *batch, m, n = boards.shape
+    c = tiles.shape[1]
+    # (..., m, n, c, c, 3) -> (..., m, c, n, c, 3)
+    cells = tiles[boards]
+    cells = np.moveaxis(cells, -4, -3)
+    return cells.reshape(*batch, m * c, n * c, 3)
 
 
 class AppleGame():
@@ -12,6 +143,8 @@ class AppleGame():
             max_steps (int, optional): 게임의 최대 턴 수
         """
         self.seed = None
+        # 게임판 생성에 쓰는 이 게임만의 난수 생성기
+        self.rng = None
 
         self.m = m
         self.n = n
@@ -24,23 +157,141 @@ class AppleGame():
         # 게임판
         self.grid = np.zeros((1, m, n), dtype=np.uint8)
 
+        # 사각형 합/사과 개수를 O(1)로 구하기 위한 누적합 테이블 (summed-area table)
+        # _sum_table[i, j] = grid[0, :i, :j]의 합
+        self._sum_table = np.zeros((m + 1, n + 1), dtype=np.int32)
+        # _count_table[i, j] = grid[0, :i, :j]의 사과 개수
+        self._count_table = np.zeros((m + 1, n + 1), dtype=np.int32)
+        # 게임판에 남아있는 사과의 합
+        self._total = 0
+
+        # 합이 10인 사각형 인덱스 (valid_rect_mask()를 처음 호출할 때 생성)
+        self._row_pairs = None
+        self._col_pairs = None
+        self._valid = None
+
     def reset(self, seed=None):
         """ 게임 초기화
+
+        Args:
+            seed (int | np.random.SeedSequence, optional): 난수 생성기의 seed
+                None이면 기존 난수 생성기를 계속 사용 (처음이라면 OS 엔트로피로 seed를 정함)
         """
         # Reset PRNG
         if seed is not None:
             self.seed = seed
-            np.random.seed(self.seed)
-            random.seed(self.seed)
-        else:
-            if self.seed is None:
-                self.seed = np.random.randint(0, 1000)
-                np.random.seed(self.seed)
-                random.seed(self.seed)
+            self.rng = np.random.default_rng(self.seed)
+        elif self.rng is None:
+            self.seed = np.random.SeedSequence().entropy
+            self.rng = np.random.default_rng(self.seed)
 
         self.steps = 0
         self.score = 0
-        self.grid = np.random.randint(1, 10, size=(1, self.m, self.n), dtype=np.uint8)
+        self.grid = self.rng.integers(1, 10, size=(1, self.m, self.n), dtype=np.uint8)
+        self._build_tables()
+        if self._valid is not None:
+            self._update_valid(0, self.m - 1, 0, self.n - 1)
+
+    def _build_tables(self):
+        """ 현재 게임판으로부터 누적합 테이블과 총합을 새로 계산
+        """
+        board = self.grid[0]
+        self._sum_table[1:, 1:] = board.cumsum(axis=0, dtype=np.int32).cumsum(axis=1)
+        self._count_table[1:, 1:] = (board > 0).cumsum(axis=0, dtype=np.int32).cumsum(axis=1)
+        self._total = int(self._sum_table[-1, -1])
+
+    @staticmethod
+    def _query(table, left, right, top, bottom):
+        """ 누적합 테이블에서 grid[0, left:right, top:bottom] 영역의 합을 O(1)로 반환
+        """
+        return int(table[right, bottom] - table[left, bottom] - table[right, top] + table[left, top])
+
+    @staticmethod
+    def _patch(table, left, right, top, bottom, removed):
+        """ grid[0, left:right, top:bottom] 영역에서 removed 만큼의 값이 빠졌을 때 누적합 테이블을 갱신
+
+        영향을 받는 칸은 (left + 1, top + 1) 이후의 부분뿐이므로 해당 부분만 수정
+        """
+        delta = removed.cumsum(axis=0, dtype=np.int32).cumsum(axis=1)
+        table[left + 1:right + 1, top + 1:bottom + 1] -= delta
+        table[right + 1:, top + 1:bottom + 1] -= delta[-1]
+        table[left + 1:right + 1, bottom + 1:] -= delta[:, -1:]
+        table[right + 1:, bottom + 1:] -= delta[-1, -1]
+
+    def _clip_square(self, square):
+        """ 사각형 좌표를 정렬하고 게임판 범위로 잘라 [left, right) x [top, bottom) 형태로 반환
+        """
+        x1, y1, x2, y2 = (int(v) for v in square)
+
+        left, right = sorted((x1, x2))
+        top, bottom = sorted((y1, y2))
+
+        left, right = min(max(left, 0), self.m), min(max(right + 1, 0), self.m)
+        top, bottom = min(max(top, 0), self.n), min(max(bottom + 1, 0), self.n)
+        return left, right, top, bottom
+
+    def _update_valid(self, x_lo, x_hi, y_lo, y_hi):
+        """ [x_lo, x_hi] x [y_lo, y_hi] 영역과 겹치는 사각형만 다시 검사하여 인덱스 갱신
+        """
+        rp1, rp2 = self._row_pairs
+        cp1, cp2 = self._col_pairs
+        ri = np.flatnonzero((rp1 <= x_hi) & (rp2 >= x_lo))
+        ci = np.flatnonzero((cp1 <= y_hi) & (cp2 >= y_lo))
+
+        left, right = rp1[ri][:, None], rp2[ri][:, None] + 1
+        top, bottom = cp1[ci][None, :], cp2[ci][None, :] + 1
+        table = self._sum_table
+        sums = table[right, bottom] - table[left, bottom] - table[right, top] + table[left, top]
+        self._valid[np.ix_(ri, ci)] = sums == 10
+
+    def valid_rect_mask(self) -> np.ndarray:
+        """ 합이 정확히 10인 사각형의 마스크 반환
+
+        처음 호출할 때 모든 사각형을 검사하여 인덱스를 만들고,
+        이후에는 사과가 제거될 때마다 제거된 영역과 겹치는 사각형만 다시 검사함
+        반환되는 배열은 내부 인덱스이므로 수정하지 말 것
+
+        Returns:
+            mask (np.ndarray): (R,) bool, enumerate_rects(m, n)의 순서와 같음
+        """
+        if self._valid is None:
+            _, self._row_pairs, self._col_pairs = enumerate_rects(self.m, self.n)
+            self._valid = np.zeros((self._row_pairs.shape[1], self._col_pairs.shape[1]), dtype=bool)
+            self._update_valid(0, self.m - 1, 0, self.n - 1)
+        return self._valid.reshape(-1)
+
+    def valid_rects(self) -> np.ndarray:
+        """ 합이 정확히 10인 모든 사각형의 좌표 반환
+
+        Returns:
+            rects (np.ndarray): (K, 4) 사각형의 좌표(좌상단, 우하단)
+        """
+        mask = self.valid_rect_mask()
+        ri, ci = np.divmod(np.flatnonzero(mask), self._col_pairs.shape[1])
+        return np.stack((self._row_pairs[0][ri], self._col_pairs[0][ci],
+                         self._row_pairs[1][ri], self._col_pairs[1][ci]), axis=1)
+
+    def rect_sum(self, square) -> int:
+        """ 사각형 내의 숫자의 합을 O(1)로 반환
+
+        Args:
+            square (_type_): 사각형의 좌표(좌상단, 우하단)
+        """
+        left, right, top, bottom = self._clip_square(square)
+        if left >= right or top >= bottom:
+            return 0
+        return self._query(self._sum_table, left, right, top, bottom)
+
+    def rect_count(self, square) -> int:
+        """ 사각형 내의 사과의 개수를 O(1)로 반환
+
+        Args:
+            square (_type_): 사각형의 좌표(좌상단, 우하단)
+        """
+        left, right, top, bottom = self._clip_square(square)
+        if left >= right or top >= bottom:
+            return 0
+        return self._query(self._count_table, left, right, top, bottom)
 
     def get_obs(self) -> np.ndarray:
         """ 게임판의 상태를 반환
@@ -60,17 +311,20 @@ class AppleGame():
         Args:
             sqaure (_type_): 플레이어가 지정한 사각형의 좌표(좌상단, 우하단)
         """
-        x1, y1, x2, y2 = square
-
-        left, right = sorted((x1, x2))
-        top, bottom = sorted((y1, y2))
+        left, right, top, bottom = self._clip_square(square)
 
-        selected = self.grid[:, left:right+1, top:bottom+1]
-        total = np.sum(selected)
+        if left < right and top < bottom:
+            total = self._query(self._sum_table, left, right, top, bottom)
 
-        if total == 10:
-            self.score += np.count_nonzero(selected)
-            self.grid[:, left:right+1, top:bottom+1] = 0
+            if total == 10:
+                selected = self.grid[0, left:right, top:bottom]
+                self.score += self._query(self._count_table, left, right, top, bottom)
+                self._patch(self._sum_table, left, right, top, bottom, selected)
+                self._patch(self._count_table, left, right, top, bottom, selected > 0)
+                self._total -= total
+                self.grid[:, left:right, top:bottom] = 0
+                if self._valid is not None:
+                    self._update_valid(left, right - 1, top, bottom - 1)
 
         self.steps += 1
 
@@ -79,7 +333,7 @@ class AppleGame():
         1. 현재 턴이 최대 턴 수에 도달했을 때
         2. 게임판에 남아있는 사과의 합이 10 미만일 때
         """
-        if self.steps >= self.max_steps or np.sum(self.grid) < 10:
+        if self.steps >= self.max_steps or self._total < 10:
             return True
         return False
 
@@ -1,33 +1,90 @@
 import gymnasium as gym
 import numpy as np
-from AppleGame import AppleGame
+from AppleGame import AppleGame, cell_tiles, enumerate_rects, render_boards
 
 
 class AppleGameEnv(gym.Env):
-    def __init__(self, m=36, n=36, max_steps=1000):
+    metadata = {"render_modes": ["console", "rgb_array"], "render_fps": 10}
+
+    def __init__(self, m=36, n=36, max_steps=1000, action_mask=False, action_mode="continuous",
+                 obs_buffer=None, reuse_info=False, render_mode=None, cell_size=16, terminate_when_stuck=None):
         """ AppleGame 환경 생성
 
         Args:
             m (int, optional): 게임판의 행 수
             n (int, optional): 게임판의 열 수
             max_steps (int, optional): 게임의 최대 턴 수
+            action_mask (bool, optional): info["action_mask"]에 합이 10인 사각형의 마스크를 포함할지 여부
+            action_mode (str, optional): 행동 공간의 종류
+                "continuous": Box(-1, 1, (4,)) 좌표를 게임판 크기에 맞게 변환
+                "discrete": Discrete(R) 모든 사각형에 번호를 붙여 선택, action_masks() 사용 가능
+            obs_buffer (np.ndarray, optional): observation을 기록할 (k, 1, m, n) uint8 링 버퍼 (k >= 2)
+                지정하지 않으면 k = 2인 버퍼를 내부에서 생성
+            reuse_info (bool, optional): 매 스텝 새 info dict를 만들지 않고 같은 dict를 갱신하여 반환할지 여부
+            render_mode (str, optional): render()의 기본 모드
+                "console": 게임판을 출력
+                "rgb_array": 게임판을 (m * cell_size, n * cell_size, 3) uint8 이미지로 반환 (RecordVideo 등)
+            cell_size (int, optional): rgb_array 이미지에서 칸 한 변의 픽셀 수
+            terminate_when_stuck (bool, optional): 합이 10인 사각형이 더 없으면 게임을 종료할지 여부
+                지정하지 않으면 action_mode="discrete"일 때만 True
+                (모든 행동이 마스킹된 채 남은 스텝을 no-op으로 소모하지 않도록 함)
+                continuous 모드의 에피소드 길이는 action_mask와 관계없이 바뀌지 않으며, 필요하면 직접 지정
+
+        Aliasing:
+            reset/step이 반환하는 observation은 링 버퍼의 한 칸이며, k - 1 스텝 동안만 값이 유지됨
+            (기본값에서는 다음 스텝까지) 이후에도 필요하다면 호출하는 쪽에서 복사해야 함
+            reuse_info=True이면 반환된 info(와 info["action_mask"])는 다음 reset/step에서 덮어써짐
+            (info에 추가된 다른 키는 다음 reset/step에서 지워짐)
         """
+        if action_mode not in ("continuous", "discrete"):
+            raise ValueError(f"action_mode: {action_mode}")
+        if render_mode is not None and render_mode not in self.metadata["render_modes"]:
+            raise ValueError(f"render_mode: {render_mode}")
+        if obs_buffer is None:
+            obs_buffer = np.empty((2, 1, m, n), dtype=np.uint8)
+        elif obs_buffer.shape[1:] != (1, m, n) or obs_buffer.shape[0] < 2 or obs_buffer.dtype != np.uint8:
+            raise ValueError(f"obs_buffer: {obs_buffer.shape}, {obs_buffer.dtype}")
+
         self.m = m
         self.n = n
 
         self.steps = 0
         self.max_steps = max_steps
+        self.action_mask = action_mask
+        self.action_mode = action_mode
+        self.reuse_info = reuse_info
+        self.render_mode = render_mode
+        self.cell_size = cell_size
+        if terminate_when_stuck is None:
+            terminate_when_stuck = action_mode == "discrete"
+        self.terminate_when_stuck = terminate_when_stuck
 
         self.reward = 0
         self.cur_score = 0
 
         self.game = AppleGame(m, n, max_steps)
 
+        # step에서 재사용하는 버퍼
+        self._obs_buffer = obs_buffer
+        self._obs_index = 0
+        self._info = {}
+        self._scale = np.array([m, n, m, n], dtype=np.float64) / 2
+        self._action = np.empty(4, dtype=np.float64)
+        self._square = np.empty(4, dtype=np.int32)
+        # rgb_array 렌더링에 쓰는 칸 타일 atlas (처음 사용할 때 생성)
+        self._tiles = None
+
         # m x n 크기의 게임판 [1, 9]
         self.observation_space = gym.spaces.Box(low=0, high=255, shape=(1, m, n), dtype=np.uint8)
 
-        # 가능한 행동: (x1, y1), (x2, y2) [-1, 1]
-        self.action_space = gym.spaces.Box(low=-1, high=1, shape=(4,), dtype=np.float32)
+        if action_mode == "discrete":
+            # 가능한 행동: enumerate_rects(m, n)의 사각형 번호 [0, R)
+            self.rects, _, _ = enumerate_rects(m, n)
+            self.action_space = gym.spaces.Discrete(len(self.rects))
+        else:
+            # 가능한 행동: (x1, y1), (x2, y2) [-1, 1]
+            self.rects = None
+            self.action_space = gym.spaces.Box(low=-1, high=1, shape=(4,), dtype=np.float32)
 
     def reset(self, seed=None, options=None):
         """ 게임 초기화
@@ -40,50 +97,102 @@ class AppleGameEnv(gym.Env):
         self.reward = 0
         self.cur_score = 0
         self.game.reset(seed)
-        return self.game.get_obs(), self._get_info()
+        return self._get_obs(), self._get_info()
 
     def _get_obs(self):
-        return self.game.get_obs()
+        """ 게임판을 링 버퍼의 다음 칸에 복사하여 반환
+        """
+        self._obs_index = (self._obs_index + 1) % len(self._obs_buffer)
+        obs = self._obs_buffer[self._obs_index]
+        np.copyto(obs, self.game.get_obs())
+        return obs
 
     def _get_info(self):
-        return {
-            "score": self.game.score,
-            "steps": self.game.steps,
-            "reward": self.reward
-        }
+        if self.reuse_info:
+            # wrapper가 추가한 키("episode", "terminal_observation" 등)가 다음 스텝에 남지 않도록 비우고,
+            # 미리 할당한 action_mask 버퍼만 다시 사용
+            info = self._info
+            mask_buffer = info.get("action_mask")
+            info.clear()
+        else:
+            info, mask_buffer = {}, None
+        info["score"] = self.game.score
+        info["steps"] = self.game.steps
+        info["reward"] = self.reward
+        if self.action_mask:
+            # enumerate_rects(m, n) 순서의 (R,) bool 마스크
+            mask = self.game.valid_rect_mask()
+            if mask_buffer is not None:
+                np.copyto(mask_buffer, mask)
+                info["action_mask"] = mask_buffer
+            else:
+                info["action_mask"] = mask.copy()
+        return info
+
+    def action_masks(self) -> np.ndarray:
+        """ 선택할 수 있는 행동(합이 10인 사각형)의 마스크 반환
+        sb3-contrib의 MaskablePPO에서 사용
+
+        Returns:
+            mask (np.ndarray): (R,) bool, action_mode="discrete"의 행동 번호 순서
+        """
+        return self.game.valid_rect_mask().copy()
 
     def step(self, action):
         """ 행동을 받아 게임을 진행
 
         Args:
-            action (_type_): 플레이어가 지정한 사각형의 좌표(좌상단, 우하단)
+            action (_type_): 플레이어가 지정한 사각형의 좌표(좌상단, 우하단) 또는 사각형 번호
         """
-        # [-1. 1] -> [0, 1]
-        action = (action + np.ones(4)) / 2
-
-        # [0, 1] -> [0, m - 1] / [0, n - 1]
-        # e.g. mxn = 10x10
-        # [0, 0.1) -> 0
-        # [0.1, 0.2) -> 1
-        # [0.2, 0.3) -> 2
-        # [0.9, 1) -> 9
-
-        action = (action * np.array([self.m, self.n, self.m, self.n])).astype(np.int8)
+        if self.action_mode == "discrete":
+            action = self.rects[int(action)]
+        else:
+            action = self._to_square(action)
 
         self.game.step(action)
 
         terminated = self.game.is_game_over()
+        if self.terminate_when_stuck and not terminated:
+            # 합이 10인 사각형 인덱스는 step마다 갱신되므로 검사 비용은 마스크 크기에 비례
+            terminated = not self.game.valid_rect_mask().any()
         truncated = self.game.steps >= self.game.max_steps
 
         self.reward = self.game.score - self.cur_score
         self.cur_score = self.game.score
 
-        return self.game.get_obs(), self.reward, terminated, truncated, self._get_info()
+        return self._get_obs(), self.reward, terminated, truncated, self._get_info()
+
+    def _to_square(self, action):
+        """ [-1, 1] 범위의 연속 행동을 게임판 좌표로 변환
+        """
+        # [-1. 1] -> [0, 2]
+        np.add(action, 1, out=self._action)
+
+        # [0, 2] -> [0, m - 1] / [0, n - 1] ((action + 1) / 2 * m와 같음)
+        # e.g. mxn = 10x10
+        # [0, 0.1) -> 0
+        # [0.1, 0.2) -> 1
+        # [0.2, 0.3) -> 2
+        # [0.9, 1) -> 9
+        np.multiply(self._action, self._scale, out=self._action)
+        np.copyto(self._square, self._action, casting="unsafe")
+        return self._square
+
+    def render(self, render_mode=None):
+        """ 게임판을 출력하거나 이미지로 반환
+
+        Args:
+            render_mode (str, optional): 지정하지 않으면 생성할 때의 render_mode (그것도 None이면 "console")
 
-    def render(self, render_mode="console"):
-        """ 게임판을 출력
+        Returns:
+            frame (np.ndarray): "rgb_array"이면 (m * cell_size, n * cell_size, 3) uint8 이미지
         """
+        render_mode = render_mode or self.render_mode or "console"
         if render_mode == "console":
             return self.game.render()
+        elif render_mode == "rgb_array":
+            if self._tiles is None:
+                self._tiles = cell_tiles(self.cell_size)
+            return render_boards(self.game.grid[0], self._tiles)
         else:
             raise NotImplementedError
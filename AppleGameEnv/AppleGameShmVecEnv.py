@@ -0,0 +1,177 @@
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+
+import gymnasium as gym
+import numpy as np
+from BatchedAppleGame import BatchedAppleGame, BatchedVecEnvMixin, reset_vec_envs, step_vec_envs, vec_env_arrays
+
+
+def _attach(names, specs):
+    """ 이름으로 공유 메모리에 연결하고 ndarray view를 만듦
+    """
+    blocks, arrays = [], {}
+    for key, (shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=names[key])
+        blocks.append(shm)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return blocks, arrays
+
+
+def _worker(remote, parent_remote, names, num_envs, lo, hi, m, n, max_steps):
+    """ [lo, hi) 범위의 게임판을 BatchedAppleGame으로 진행하는 worker
+
+    게임판, 점수, 스텝 수는 공유 메모리에 직접 기록되며,
+    파이프로는 짧은 명령과 완료 신호만 주고받음
+    """
+    parent_remote.close()
+    blocks, arrays = _attach(names, vec_env_arrays(num_envs, m, n))
+
+    game = BatchedAppleGame(hi - lo, m, n, max_steps)
+    # 맡은 범위의 view, BatchedAppleGame은 모든 상태를 in-place로 갱신하므로 공유 메모리에 직접 기록됨
+    arrays = {key: array[lo:hi] for key, array in arrays.items()}
+    game.bind(arrays["obs"], arrays["score"], arrays["steps"])
+    cur_score = np.zeros(hi - lo, dtype=np.int64)
+
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                step_vec_envs(game, arrays, cur_score)
+                remote.send(None)
+            elif cmd == "reset":
+                reset_vec_envs(game, arrays, cur_score, data)
+                remote.send(None)
+            elif cmd == "close":
+                break
+            else:
+                raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        del game, arrays
+        for shm in blocks:
+            shm.close()
+        remote.close()
+
+
+class AppleGameShmVecEnv(BatchedVecEnvMixin, gym.vector.VectorEnv):
+    def __init__(self, num_envs=8, m=36, n=36, max_steps=1000, num_workers=None, context=None,
+                 render_mode=None, cell_size=16):
+        """ 여러 프로세스에서 AppleGame을 진행하는 공유 메모리 기반 Gymnasium vector 환경 생성
+
+        각 worker는 자신이 맡은 게임판들을 BatchedAppleGame으로 한 번에 진행하고,
+        게임판은 (N, 1, m, n) uint8 공유 메모리에 직접 기록함
+        행동/보상/종료 플래그도 공유 배열로 주고받으므로 observation을 pickle하지 않음
+        observation/action/info의 형태는 AppleGameVecEnv와 같음
+
+        Args:
+            num_envs (int, optional): 동시에 진행할 게임판의 수
+            m (int, optional): 게임판의 행 수
+            n (int, optional): 게임판의 열 수
+            max_steps (int, optional): 게임의 최대 턴 수
+            num_workers (int, optional): worker 프로세스 수 (기본값: min(num_envs, CPU 수))
+            context (str, optional): multiprocessing start method ("fork", "spawn", "forkserver")
+            render_mode (str, optional): "rgb_array"이면 render()가 모든 게임판의 이미지를 반환
+            cell_size (int, optional): 이미지에서 칸 한 변의 픽셀 수
+        """
+        if render_mode is not None and render_mode != "rgb_array":
+            raise ValueError(f"render_mode: {render_mode}")
+        self.render_mode = render_mode
+        self.cell_size = cell_size
+        # rgb_array 렌더링에 쓰는 칸 타일 atlas (처음 사용할 때 생성)
+        self._tiles = None
+
+        self.m = m
+        self.n = n
+        self.max_steps = max_steps
+
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        num_workers = max(1, min(num_workers, num_envs))
+
+        specs = vec_env_arrays(num_envs, m, n)
+        self._blocks = {}
+        self._arrays = {}
+        for key, (shape, dtype) in specs.items():
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            self._blocks[key] = shm
+            self._arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            self._arrays[key][...] = 0
+        names = {key: shm.name for key, shm in self._blocks.items()}
+
+        ctx = mp.get_context(context)
+        self._bounds = [int(b) for b in np.linspace(0, num_envs, num_workers + 1)]
+        self.remotes, self.processes = [], []
+        for lo, hi in zip(self._bounds[:-1], self._bounds[1:]):
+            remote, work_remote = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(work_remote, remote, names, num_envs, lo, hi, m, n, max_steps),
+                daemon=True,
+            )
+            process.start()
+            work_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+
+        super().__init__(
+            num_envs,
+            # m x n 크기의 게임판 [1, 9]
+            gym.spaces.Box(low=0, high=255, shape=(1, m, n), dtype=np.uint8),
+            # 가능한 행동: (x1, y1), (x2, y2) [-1, 1]
+            gym.spaces.Box(low=-1, high=1, shape=(4,), dtype=np.float32),
+        )
+
+    def _wait(self):
+        for remote in self.remotes:
+            remote.recv()
+
+    def reset_async(self, seed=None, options=None):
+        if options is not None:
+            raise ValueError(f"options: {options}")
+
+        # 게임판마다 독립된 난수 스트림, worker 수와 관계없이 AppleGameVecEnv와 같은 게임판이 생성됨
+        if seed is not None and not isinstance(seed, (list, tuple)):
+            if not isinstance(seed, np.random.SeedSequence):
+                seed = np.random.SeedSequence(seed)
+            seed = seed.spawn(self.num_envs)
+        for remote, lo, hi in zip(self.remotes, self._bounds[:-1], self._bounds[1:]):
+            remote.send(("reset", None if seed is None else list(seed[lo:hi])))
+
+    def reset_wait(self, seed=None, options=None):
+        """ 모든 게임판 초기화
+        """
+        self._wait()
+        return self._arrays["obs"].copy(), self._get_info()
+
+    def step_async(self, actions):
+        np.copyto(self._arrays["actions"], actions, casting="unsafe")
+        for remote in self.remotes:
+            remote.send(("step", None))
+
+    def step_wait(self):
+        """ 모든 게임판을 한 번에 진행
+        """
+        self._wait()
+        return self._step_result()
+
+    def close_extras(self, **kwargs):
+        """ worker를 종료하고 공유 메모리를 해제
+        """
+        for remote in self.remotes:
+            try:
+                remote.send(("close", None))
+            except (BrokenPipeError, EOFError):
+                pass
+        for process in self.processes:
+            process.join()
+        for remote in self.remotes:
+            remote.close()
+
+        self._arrays = {}
+        for shm in self._blocks.values():
+            shm.close()
+            shm.unlink()
+        self._blocks = {}
@@ -0,0 +1,353 @@
+import argparse
+import sys
+import time
+from functools import lru_cache
+
+import numpy as np
+from AppleGame import AppleGame
+
+
+@lru_cache(maxsize=None)
+def _row_pairs(m):
+    """ 0 <= x1 <= x2 < m인 모든 행 쌍 (enumerate_rects와 같은 순서)
+    """
+    x1, x2 = np.triu_indices(m)
+    return x1, x2
+
+
+def _prefix(values):
+    """ (m, n) 배열의 (m + 1, n + 1) 누적합 테이블 (AppleGame._sum_table과 같은 형태)
+    """
+    table = np.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=np.int32)
+    table[1:, 1:] = values.cumsum(axis=0, dtype=np.int32).cumsum(axis=1)
+    return table
+
+
+def _query(table, left, right, top, bottom):
+    """ 누적합 테이블에서 [left, right) x [top, bottom) 영역들의 합 (배열 단위)
+    """
+    return table[right, bottom] - table[left, bottom] - table[right, top] + table[left, top]
+
+
+def valid_moves(board):
+    """ 게임판에서 가능한 서로 다른 모든 행동을 누적합으로 한 번에 구함
+
+    합이 10인 사각형 중 가장자리의 행/열마다 사과가 있는 사각형(사과들의 bounding box)만 남김
+    빈 행/열을 더 포함하는 사각형은 같은 사과를 지우므로 같은 행동임
+
+    행 쌍마다 열 방향 누적합은 증가하는 수열이므로, 사과가 있는 왼쪽 열 y1마다
+    합이 정확히 10이 되는 오른쪽 열 y2는 searchsorted로 한 번에 찾음 (모든 열 쌍을 검사하지 않음)
+
+    Args:
+        board (np.ndarray): (m, n) 게임판
+
+    Returns:
+        rects (np.ndarray): (K, 4) 사각형 좌표 (x1, y1, x2, y2), AppleGame.step에 그대로 사용 가능
+        counts (np.ndarray): (K,) 각 사각형이 지우는 사과의 개수
+    """
+    m, n = board.shape
+    r1, r2 = _row_pairs(m)
+    sums = _prefix(board)
+    # band[p, j] = board[r1[p]:r2[p] + 1, :j]의 합
+    band = sums[r2 + 1] - sums[r1]
+
+    # 행마다 (최댓값 + 11)씩 더해 한 줄로 펴면 전체가 정렬된 상태로 유지되고 다른 행의 값과 겹치지 않음
+    offset = (np.arange(len(r1), dtype=np.int64) * (int(band[:, -1].max()) + 11))[:, None]
+    flat = (band + offset).ravel()
+    target = band[:, :-1] + offset + 10
+    index = np.minimum(np.searchsorted(flat, target.ravel()), flat.size - 1).reshape(target.shape)
+    # y1 열에 사과가 있고 y1부터의 합이 정확히 10이 되는 열이 같은 행 쌍 안에 있는 경우
+    found = (flat[index] == target) & (band[:, 1:] > band[:, :-1])
+
+    p, y1 = np.nonzero(found)
+    y2 = index[p, y1] % (n + 1) - 1
+    x1, x2 = r1[p], r2[p]
+
+    # 맨 위/아래 행에도 사과가 있어야 bounding box
+    tight = (_query(sums, x1, x1 + 1, y1, y2 + 1) > 0) & (_query(sums, x2, x2 + 1, y1, y2 + 1) > 0)
+    rects = np.stack([x1, y1, x2, y2], axis=1)[tight]
+    return rects, _query(_prefix(board > 0), rects[:, 0], rects[:, 2] + 1, rects[:, 1], rects[:, 3] + 1)
+
+
+def apply_move(board, rect):
+    """ 사각형 안의 사과를 지운 새 게임판 반환
+
+    Args:
+        board (np.ndarray): (m, n) 게임판
+        rect (np.ndarray): (x1, y1, x2, y2) valid_moves가 반환한 사각형
+
+    Returns:
+        board (np.ndarray): (m, n) 새 게임판
+    """
+    x1, y1, x2, y2 = rect
+    board = board.copy()
+    board[x1:x2 + 1, y1:y2 + 1] = 0
+    return board
+
+
+def _upper_bounds(counts):
+    """ 값별 사과 개수로부터 지울 수 있는 사과 개수의 상한을 계산 (upper_bound 참고)
+
+    Args:
+        counts (np.ndarray): (K, 10) counts[k, v] = k번째 게임판에서 값이 v인 사과의 개수
+
+    Returns:
+        bounds (np.ndarray): (K,) 상한
+    """
+    counts = counts.astype(np.int64)
+    counts[:, 9] = np.minimum(counts[:, 9], counts[:, 1])
+    remaining = counts[:, 1:] @ np.arange(1, 10) // 10 * 10
+
+    bounds = np.zeros(len(counts), dtype=np.int64)
+    for value in range(1, 10):
+        take = np.minimum(counts[:, value], remaining // value)
+        bounds += take
+        remaining -= take * value
+    return bounds
+
+
+def upper_bound(board):
+    """ 게임판에서 앞으로 얻을 수 있는 점수의 상한
+
+    1. 한 번에 지우는 사과의 합은 정확히 10이므로 지울 수 있는 사과의 합은 10의 배수이고 총합 이하
+       그 합 안에 들어갈 수 있는 사과의 최대 개수는 작은 값부터 고를 때의 개수
+    2. 9는 1 하나와 함께일 때만 지울 수 있으므로 지울 수 있는 9의 개수는 1의 개수 이하
+
+    Args:
+        board (np.ndarray): (m, n) 게임판
+
+    Returns:
+        bound (int): 지울 수 있는 사과 개수의 상한
+    """
+    return int(_upper_bounds(np.bincount(board.ravel(), minlength=10)[None])[0])
+
+
+def child_upper_bounds(board, rects):
+    """ 각 행동 뒤의 게임판에 대한 upper_bound를 게임판을 만들지 않고 한 번에 계산
+
+    값별 누적합 테이블로 사각형마다 지워지는 값별 사과 개수를 구해 현재 개수에서 뺌
+
+    Args:
+        board (np.ndarray): (m, n) 게임판
+        rects (np.ndarray): (K, 4) valid_moves가 반환한 사각형
+
+    Returns:
+        bounds (np.ndarray): (K,) 상한
+    """
+    values = np.arange(10)[:, None, None]
+    tables = np.zeros((10, board.shape[0] + 1, board.shape[1] + 1), dtype=np.int32)
+    tables[:, 1:, 1:] = (board[None] == values).cumsum(axis=1, dtype=np.int32).cumsum(axis=2)
+    x1, y1, x2, y2 = rects.T
+    removed = tables[:, x2 + 1, y2 + 1] - tables[:, x1, y2 + 1] - tables[:, x2 + 1, y1] + tables[:, x1, y1]
+    return _upper_bounds(tables[:, -1, -1][None] - removed.T)
+
+
+def greedy_play(board, largest=True):
+    """ 매 턴 가장 많은(largest=False면 가장 적은) 사과를 지우는 행동을 고르는 플레이어
+
+    Args:
+        board (np.ndarray): (m, n) 게임판
+        largest (bool, optional): True면 가장 많이, False면 가장 적게 지우는 행동을 고름
+
+    Returns:
+        score (int): 얻은 점수
+        moves (list): 고른 사각형들
+    """
+    score, moves = 0, []
+    while True:
+        rects, counts = valid_moves(board)
+        if len(rects) == 0:
+            return score, moves
+        best = int(np.argmax(counts) if largest else np.argmin(counts))
+        board = apply_move(board, rects[best])
+        score += int(counts[best])
+        moves.append(tuple(int(v) for v in rects[best]))
+
+
+class AppleGameSolver():
+    def __init__(self, board, seed=0):
+        """ 하나의 게임판에 대한 탐색기 생성
+
+        탐색한 게임판은 Zobrist hash로 transposition table에 기록함
+        게임판이 같으면 지금까지의 점수(지운 사과 수)도 같으므로 같은 게임판은 한 번만 탐색함
+
+        Args:
+            board (np.ndarray): (m, n) 또는 (1, m, n) 게임판 (AppleGame.grid)
+            seed (int, optional): Zobrist 키를 만드는 seed
+        """
+        self.board = np.array(board, dtype=np.uint8).reshape(board.shape[-2:])
+        self.m, self.n = self.board.shape
+
+        # _keys[i, j, v]: (i, j) 칸의 값이 v일 때의 키, 게임판의 hash는 모든 칸의 키를 XOR한 값
+        self._keys = np.random.default_rng(seed).integers(0, 2 ** 63, size=(self.m, self.n, 10), dtype=np.uint64)
+        self._rows = np.arange(self.m)[:, None]
+        self._cols = np.arange(self.n)[None, :]
+
+        # 탐색한 게임판의 수
+        self.nodes = 0
+
+    def board_hash(self, board):
+        """ 게임판의 Zobrist hash
+        """
+        return int(np.bitwise_xor.reduce(self._keys[self._rows, self._cols, board], axis=None))
+
+    def move_hashes(self, board, board_hash, rects):
+        """ 각 행동 뒤의 게임판 hash를 게임판을 만들지 않고 한 번에 계산
+
+        칸을 지울 때 hash의 변화는 keys[값] ^ keys[0]이므로, 그 XOR 누적 테이블로 사각형마다 O(1)에 구함
+        """
+        delta = self._keys[self._rows, self._cols, board] ^ self._keys[:, :, 0]
+        table = np.zeros((self.m + 1, self.n + 1), dtype=np.uint64)
+        table[1:, 1:] = np.bitwise_xor.accumulate(np.bitwise_xor.accumulate(delta, axis=0), axis=1)
+        x1, y1, x2, y2 = rects.T
+        return board_hash ^ table[x2 + 1, y2 + 1] ^ table[x1, y2 + 1] ^ table[x2 + 1, y1] ^ table[x1, y1]
+
+    def expand(self, board, board_hash, score):
+        """ 게임판에서 가능한 행동과 그 뒤의 hash, 점수, 상한을 한 번에 계산
+
+        Returns:
+            rects (np.ndarray): (K, 4) 사각형
+            counts (np.ndarray): (K,) 지우는 사과의 개수
+            keys (np.ndarray): (K,) 행동 뒤의 게임판 hash
+            bounds (np.ndarray): (K,) 행동 뒤의 점수 + upper_bound
+        """
+        self.nodes += 1
+        rects, counts = valid_moves(board)
+        keys = self.move_hashes(board, board_hash, rects)
+        return rects, counts, keys, score + counts + child_upper_bounds(board, rects)
+
+    def beam_search(self, beam_width=50):
+        """ 턴마다 가장 유망한 beam_width개의 게임판만 남기며 탐색
+
+        (점수 + upper_bound)가 큰 게임판을, 같다면 적은 사과를 지운 게임판을 남김
+        상한이 크다는 것은 10을 만들 수 없게 된 사과가 적다는 뜻이고,
+        적게 지우는 행동이 나중의 조합을 더 많이 남기기 때문 (greedy_play(largest=False) 참고)
+
+        Args:
+            beam_width (int, optional): 턴마다 남길 게임판의 수
+
+        Returns:
+            score (int): 찾은 가장 높은 점수
+            moves (list): 그 점수를 얻는 사각형들
+        """
+        beam = [(self.board, self.board_hash(self.board), 0, [])]
+        visited = {beam[0][1]}
+        best_score, best_moves = 0, []
+
+        while beam:
+            expanded = []
+            for index, (board, board_hash, score, moves) in enumerate(beam):
+                rects, counts, keys, bounds = self.expand(board, board_hash, score)
+                if score > best_score:
+                    best_score, best_moves = score, moves
+                expanded.append((np.full(len(rects), index), rects, counts, keys, bounds))
+            if not expanded:
+                break
+            parents, rects, counts, keys, bounds = (np.concatenate(arrays) for arrays in zip(*expanded))
+
+            # 유망한 순서로 훑으면서 이미 본 게임판을 건너뛰고 beam_width개의 게임판만 만듦
+            next_beam = []
+            for i in np.lexsort((counts, -bounds)).tolist():
+                if len(next_beam) == beam_width:
+                    break
+                key = int(keys[i])
+                if key in visited:
+                    continue
+                visited.add(key)
+                board, _, score, moves = beam[parents[i]]
+                next_beam.append((apply_move(board, rects[i]), key, score + int(counts[i]),
+                                  moves + [tuple(int(v) for v in rects[i])]))
+            beam = next_beam
+
+        return best_score, best_moves
+
+    def branch_and_bound(self, max_nodes=100_000, initial_score=0):
+        """ 깊이 우선 branch-and-bound 탐색
+
+        행동 뒤의 (점수 + upper_bound)가 이미 찾은 점수 이하인 행동과
+        이미 탐색한 게임판(transposition table)은 건너뜀
+        상한이 큰 행동부터, 같다면 적은 사과를 지우는 행동부터 탐색함
+
+        Args:
+            max_nodes (int, optional): 탐색할 최대 게임판 수
+            initial_score (int, optional): 이미 알고 있는 점수 (예: beam_search 결과), 이하의 해는 가지치기함
+
+        Returns:
+            score (int): 찾은 가장 높은 점수
+            moves (list): 그 점수를 얻는 사각형들 (initial_score보다 좋은 해가 없으면 빈 리스트)
+            optimal (bool): max_nodes 안에 탐색을 마쳐 score가 최적임이 증명되었는지 여부
+        """
+        best = {"score": initial_score, "moves": []}
+        visited = set()
+        path = []
+
+        def search(board, board_hash, score):
+            if score > best["score"]:
+                best["score"], best["moves"] = score, list(path)
+            if self.nodes >= max_nodes:
+                return False
+
+            rects, counts, keys, bounds = self.expand(board, board_hash, score)
+            for i in np.lexsort((counts, -bounds)).tolist():
+                if bounds[i] <= best["score"]:
+                    # 상한 순서로 탐색하므로 나머지 행동도 모두 가지치기됨
+                    break
+                key = int(keys[i])
+                if key in visited:
+                    continue
+                visited.add(key)
+                path.append(tuple(int(v) for v in rects[i]))
+                complete = search(apply_move(board, rects[i]), key, score + int(counts[i]))
+                path.pop()
+                if not complete:
+                    return False
+            return True
+
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, self.m * self.n + 100))
+        try:
+            optimal = search(self.board, self.board_hash(self.board), 0)
+        finally:
+            sys.setrecursionlimit(limit)
+        return best["score"], best["moves"], optimal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Greedy, beam search and branch-and-bound baselines for AppleGame.")
+    parser.add_argument("--size", type=int, nargs=2, default=[10, 10], metavar=("M", "N"), help="Board size.")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2], help="Seeds of the boards (AppleGame.reset).")
+    parser.add_argument("--beam-width", type=int, default=50, help="Beam width (0 to skip).")
+    parser.add_argument("--max-nodes", type=int, default=20_000, help="Node limit of branch-and-bound (0 to skip).")
+    args = parser.parse_args()
+
+    m, n = args.size
+    game = AppleGame(m, n)
+    for seed in args.seeds:
+        game.reset(seed)
+        board = game.grid[0].copy()
+        solver = AppleGameSolver(board)
+        results = [("upper bound", upper_bound(board), None)]
+
+        for name, largest in (("greedy (most)", True), ("greedy (fewest)", False)):
+            start = time.perf_counter()
+            results.append((name, greedy_play(board, largest)[0], time.perf_counter() - start))
+
+        best = max(score for _, score, _ in results[1:])
+        if args.beam_width > 0:
+            start = time.perf_counter()
+            score, _ = solver.beam_search(args.beam_width)
+            results.append(("beam", score, time.perf_counter() - start))
+            best = max(best, score)
+
+        if args.max_nodes > 0:
+            solver.nodes = 0
+            start = time.perf_counter()
+            score, _, optimal = solver.branch_and_bound(args.max_nodes, initial_score=best)
+            results.append(("branch-and-bound" + (" (optimal)" if optimal else ""), score, time.perf_counter() - start))
+
+        print(f"seed {seed}: " + ", ".join(f"{name} {score}" + (f" ({elapsed:.2f}s)" if elapsed is not None else "")
+                                           for name, score, elapsed in results))
+
+
+if __name__ == "__main__":
+    main()
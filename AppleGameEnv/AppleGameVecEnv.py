@@ -0,0 +1,65 @@
+import gymnasium as gym
+import numpy as np
+from BatchedAppleGame import BatchedAppleGame, BatchedVecEnvMixin, reset_vec_envs, step_vec_envs, vec_env_arrays
+
+
+class AppleGameVecEnv(BatchedVecEnvMixin, gym.vector.VectorEnv):
+    def __init__(self, num_envs=8, m=36, n=36, max_steps=1000, render_mode=None, cell_size=16):
+        """ N개의 AppleGame을 한 번에 진행하는 Gymnasium vector 환경 생성
+
+        각 하위 환경의 observation/action/info는 AppleGameEnv와 같은 형태
+        종료된 하위 환경은 자동으로 초기화되며, 마지막 observation과 info는
+        info["final_observation"], info["final_info"]에 담김
+
+        Args:
+            num_envs (int, optional): 동시에 진행할 게임판의 수
+            m (int, optional): 게임판의 행 수
+            n (int, optional): 게임판의 열 수
+            max_steps (int, optional): 게임의 최대 턴 수
+            render_mode (str, optional): "rgb_array"이면 render()가 모든 게임판의 이미지를 반환
+            cell_size (int, optional): 이미지에서 칸 한 변의 픽셀 수
+        """
+        if render_mode is not None and render_mode != "rgb_array":
+            raise ValueError(f"render_mode: {render_mode}")
+        self.render_mode = render_mode
+        self.cell_size = cell_size
+        # rgb_array 렌더링에 쓰는 칸 타일 atlas (처음 사용할 때 생성)
+        self._tiles = None
+
+        self.m = m
+        self.n = n
+        self.max_steps = max_steps
+
+        self.game = BatchedAppleGame(num_envs, m, n, max_steps)
+
+        # AppleGameShmVecEnv와 같은 배열에 게임판/보상/종료 플래그를 기록
+        self._arrays = {key: np.zeros(shape, dtype=dtype)
+                        for key, (shape, dtype) in vec_env_arrays(num_envs, m, n).items()}
+        self.game.bind(self._arrays["obs"], self._arrays["score"], self._arrays["steps"])
+        self.cur_score = np.zeros(num_envs, dtype=np.int64)
+
+        super().__init__(
+            num_envs,
+            # m x n 크기의 게임판 [1, 9]
+            gym.spaces.Box(low=0, high=255, shape=(1, m, n), dtype=np.uint8),
+            # 가능한 행동: (x1, y1), (x2, y2) [-1, 1]
+            gym.spaces.Box(low=-1, high=1, shape=(4,), dtype=np.float32),
+        )
+
+    def reset_wait(self, seed=None, options=None):
+        """ 모든 게임판 초기화
+        """
+        if options is not None:
+            raise ValueError(f"options: {options}")
+
+        reset_vec_envs(self.game, self._arrays, self.cur_score, seed)
+        return self._arrays["obs"].copy(), self._get_info()
+
+    def step_async(self, actions):
+        np.copyto(self._arrays["actions"], actions, casting="unsafe")
+
+    def step_wait(self):
+        """ 모든 게임판을 한 번에 진행
+        """
+        step_vec_envs(self.game, self._arrays, self.cur_score)
+        return self._step_result()
@@ -0,0 +1,256 @@
+import numpy as np
+from AppleGame import cell_tiles, generate_boards, render_boards, spawn_rngs
+
+
+class BatchedAppleGame():
+    def __init__(self, num_envs=8, m=10, n=10, max_steps=100):
+        """ N개의 AppleGame을 하나의 ndarray로 묶어 동시에 진행하는 객체 생성
+
+        Args:
+            num_envs (int, optional): 동시에 진행할 게임판의 수
+            m (int, optional): 게임판의 행 수
+            n (int, optional): 게임판의 열 수
+            max_steps (int, optional): 게임의 최대 턴 수
+        """
+        # 게임판마다 독립된 난수 생성기 (reset에서 생성)
+        self.rngs = None
+
+        self.num_envs = num_envs
+        self.m = m
+        self.n = n
+
+        self.max_steps = max_steps
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+
+        # 각 게임판의 현재 에피소드 총 점수
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        # 게임판 (N, 1, m, n): 각 게임판은 AppleGame.grid와 같은 (1, m, n) 모양
+        self.grid = np.zeros((num_envs, 1, m, n), dtype=np.uint8)
+        # 각 게임판에 남아있는 사과의 합
+        self.totals = np.zeros(num_envs, dtype=np.int64)
+
+        self._rows = np.arange(m)
+        self._cols = np.arange(n)
+
+    def reset(self, seed=None):
+        """ 모든 게임판 초기화
+
+        Args:
+            seed (int | np.random.SeedSequence | list, optional): 난수 생성기의 seed
+                int/SeedSequence이면 spawn_rngs로 게임판마다 독립된 생성기를 만듦
+                list이면 i번째 게임판에 i번째 seed를 사용
+                None이면 기존 난수 생성기를 계속 사용 (처음이라면 OS 엔트로피 사용)
+        """
+        if isinstance(seed, (list, tuple)):
+            if len(seed) != self.num_envs:
+                raise ValueError(f"seed: expected {self.num_envs} seeds, got {len(seed)}")
+            self.rngs = [np.random.default_rng(s) for s in seed]
+        elif seed is not None or self.rngs is None:
+            self.rngs = spawn_rngs(seed, self.num_envs)
+
+        self.reset_envs(np.ones(self.num_envs, dtype=bool))
+
+    def reset_envs(self, mask):
+        """ mask가 True인 게임판만 새로 생성하여 초기화
+
+        Args:
+            mask (np.ndarray): (N,) bool 배열
+        """
+        indices = np.flatnonzero(mask)
+        if len(indices) == 0:
+            return
+
+        boards = generate_boards([self.rngs[i] for i in indices], self.m, self.n)
+        self.grid[indices] = boards
+        self.totals[indices] = boards.sum(axis=(1, 2, 3))
+        self.steps[indices] = 0
+        self.score[indices] = 0
+
+    def bind(self, grid, score, steps):
+        """ 게임판, 점수, 스텝 수를 외부 배열(예: 공유 메모리 view)로 교체
+
+        모든 상태는 in-place로 갱신되므로 이후의 진행은 주어진 배열에 직접 기록됨
+
+        Args:
+            grid (np.ndarray): (N, 1, m, n) uint8
+            score (np.ndarray): (N,) int64
+            steps (np.ndarray): (N,) int64
+        """
+        grid[...] = self.grid
+        score[...] = self.score
+        steps[...] = self.steps
+        self.grid, self.score, self.steps = grid, score, steps
+
+    def get_obs(self) -> np.ndarray:
+        """ 모든 게임판의 상태를 반환
+
+        Returns:
+            self.grid (np.ndarray): (N, 1, m, n) 게임판의 상태
+        """
+        return self.grid
+
+    def step(self, squares):
+        """ N개의 행동을 받아 모든 게임판을 한 번에 진행
+
+        각 게임판에서 지정한 사각형 내의 숫자의 합이 10인지 확인
+        10이라면 해당 사각형안의 사과의 개수를 점수로 추가하고 사과를 제거
+
+        Args:
+            squares (np.ndarray): (N, 4) 각 게임판에 지정한 사각형의 좌표(좌상단, 우하단)
+        """
+        squares = np.asarray(squares, dtype=np.int64)
+        x1, y1, x2, y2 = squares.T
+
+        left = np.clip(np.minimum(x1, x2), 0, self.m)
+        right = np.clip(np.maximum(x1, x2) + 1, 0, self.m)
+        top = np.clip(np.minimum(y1, y2), 0, self.n)
+        bottom = np.clip(np.maximum(y1, y2) + 1, 0, self.n)
+
+        # (N, m, n) 사각형 마스크
+        row_mask = (self._rows >= left[:, None]) & (self._rows < right[:, None])
+        col_mask = (self._cols >= top[:, None]) & (self._cols < bottom[:, None])
+        rect = row_mask[:, :, None] & col_mask[:, None, :]
+
+        boards = self.grid[:, 0]
+        selected = np.where(rect, boards, 0)
+        total = selected.sum(axis=(1, 2), dtype=np.int64)
+
+        cleared = total == 10
+        self.score += np.count_nonzero(selected, axis=(1, 2)) * cleared
+        self.totals -= total * cleared
+        boards[rect & cleared[:, None, None]] = 0
+
+        self.steps += 1
+
+    def is_game_over(self) -> np.ndarray:
+        """ 각 게임판의 종료 여부 반환
+        1. 현재 턴이 최대 턴 수에 도달했을 때
+        2. 게임판에 남아있는 사과의 합이 10 미만일 때
+        """
+        return (self.steps >= self.max_steps) | (self.totals < 10)
+
+    def get_score(self) -> np.ndarray:
+        """ 각 게임판의 현재 에피소드 점수 반환
+
+        Returns:
+            self.score (np.ndarray): (N,) 각 게임판의 현재 점수
+        """
+        return self.score
+
+
+def vec_env_arrays(num_envs, m, n):
+    """ vector 환경이 주고받는 배열의 (모양, dtype) 목록
+
+    AppleGameVecEnv와 AppleGameShmVecEnv(공유 메모리)가 같은 배열을 사용하므로
+    observation/info의 형태가 항상 같음
+    """
+    return {
+        "obs": ((num_envs, 1, m, n), np.uint8),
+        "final_obs": ((num_envs, 1, m, n), np.uint8),
+        "actions": ((num_envs, 4), np.float32),
+        "rewards": ((num_envs,), np.float64),
+        "terminated": ((num_envs,), np.bool_),
+        "truncated": ((num_envs,), np.bool_),
+        "score": ((num_envs,), np.int64),
+        "steps": ((num_envs,), np.int64),
+        "final_score": ((num_envs,), np.int64),
+        "final_steps": ((num_envs,), np.int64),
+    }
+
+
+def reset_vec_envs(game, arrays, cur_score, seed=None):
+    """ 모든 게임판 초기화 (game은 arrays의 obs/score/steps에 bind되어 있어야 함)
+    """
+    game.reset(seed)
+    arrays["rewards"][:] = 0
+    cur_score[:] = 0
+
+
+def step_vec_envs(game, arrays, cur_score):
+    """ arrays["actions"]로 모든 게임판을 진행하고, 종료된 게임판의 마지막 상태를 기록한 뒤 초기화
+
+    Args:
+        game (BatchedAppleGame): arrays의 obs/score/steps에 bind된 게임
+        arrays (dict): vec_env_arrays의 배열 (worker라면 맡은 범위의 view)
+        cur_score (np.ndarray): (N,) 보상 계산에 쓰는 직전 점수, in-place로 갱신
+    """
+    # [-1. 1] -> [0, m] / [0, n], AppleGameEnv.step과 같은 변환
+    scale = np.array([game.m, game.n, game.m, game.n], dtype=np.float64) / 2
+    game.step(((arrays["actions"] + 1) * scale).astype(np.int64))
+
+    terminated = arrays["terminated"]
+    truncated = arrays["truncated"]
+    terminated[:] = game.is_game_over()
+    truncated[:] = game.steps >= game.max_steps
+
+    arrays["rewards"][:] = game.score - cur_score
+    cur_score[:] = game.score
+
+    done = terminated | truncated
+    if done.any():
+        arrays["final_obs"][done] = game.grid[done]
+        arrays["final_score"][done] = game.score[done]
+        arrays["final_steps"][done] = game.steps[done]
+        game.reset_envs(done)
+        cur_score[done] = 0
+
+
+class BatchedVecEnvMixin:
+    """ AppleGameVecEnv와 AppleGameShmVecEnv가 공유하는 info 구성, 결과 반환, 렌더링
+
+    하위 클래스는 num_envs, render_mode, cell_size, _tiles(None으로 초기화)와
+    vec_env_arrays 형태의 _arrays를 가져야 함
+    """
+
+    def _get_info(self, final=False):
+        """ 게임판별 info 구성
+
+        Args:
+            final (bool, optional): step 직후라면 True, 종료되어 초기화된 게임판의 마지막 observation/info를
+                info["final_observation"], info["final_info"]에 담고 score/steps를 종료 시점의 값으로 둠
+        """
+        arrays = self._arrays
+        info = {
+            "score": arrays["score"].copy(),
+            "steps": arrays["steps"].copy(),
+            "reward": arrays["rewards"].copy(),
+        }
+        mask = np.ones(self.num_envs, dtype=bool)
+        for key in ("score", "steps", "reward"):
+            info[f"_{key}"] = mask
+
+        done = arrays["terminated"] | arrays["truncated"]
+        if final and done.any():
+            final_observation = np.empty(self.num_envs, dtype=object)
+            final_info = np.empty(self.num_envs, dtype=object)
+            for i in np.flatnonzero(done):
+                # 게임판은 이미 초기화되었으므로 종료 시점의 값으로 되돌림
+                info["score"][i] = arrays["final_score"][i]
+                info["steps"][i] = arrays["final_steps"][i]
+                final_observation[i] = arrays["final_obs"][i].copy()
+                final_info[i] = {key: info[key][i] for key in ("score", "steps", "reward")}
+
+            info["final_observation"] = final_observation
+            info["_final_observation"] = done
+            info["final_info"] = final_info
+            info["_final_info"] = done
+        return info
+
+    def _step_result(self):
+        """ step_wait의 반환값 (obs, rewards, terminated, truncated, info)
+        """
+        arrays = self._arrays
+        return (arrays["obs"].copy(), arrays["rewards"].copy(), arrays["terminated"].copy(),
+                arrays["truncated"].copy(), self._get_info(final=True))
+
+    def render(self):
+        """ 모든 게임판의 이미지를 반환 (화면 없이 NumPy로 그림)
+
+        Returns:
+            frames (np.ndarray): (N, m * cell_size, n * cell_size, 3) uint8
+        """
+        if self.render_mode != "rgb_array":
+            raise NotImplementedError
+        if self._tiles is None:
+            self._tiles = cell_tiles(self.cell_size)
+        return render_boards(self._arrays["obs"][:, 0], self._tiles)
@@ -1,53 +1,102 @@
+import numpy as np
 import pygame
 
 
 class UI:
-    def __init__(self, game, cell_size=50):
+    def __init__(self, game, cell_size=50, interactive=True):
         self.game = game
         self.cell_size = cell_size
+        # False면 화면만 보여주고 마우스 입력으로 게임을 진행하지 않음 (예: 에이전트 평가 화면)
+        self.interactive = interactive
         self.width = game.n * cell_size
         self.height = game.m * cell_size
         self.screen = pygame.display.set_mode((self.width, self.height + 50))  # Add extra space for info
         pygame.font.init()  # Initialize the font module
         self.font = pygame.font.SysFont(None, 36)  # Initialize font
 
+        # 1~9 숫자를 칸 크기에 맞춰 미리 렌더링해 두고 매 프레임 재사용 (50px 칸에서 36pt)
+        digit_font = pygame.font.SysFont(None, cell_size * 36 // 50)
+        self.digits = {value: digit_font.render(str(value), True, (0, 0, 0)) for value in range(1, 10)}
+        self.digit_offset = (cell_size * 3 // 10, cell_size // 5)
+        # 게임판을 그려두는 surface, 바뀐 칸만 다시 그림
+        self.board = pygame.Surface((self.width, self.height))
+        # 마지막으로 그린 게임판 (None이면 전체를 다시 그림)
+        self.prev_grid = None
+        self.info_rect = pygame.Rect(0, self.height, self.width, 50)
+        self.prev_info = None
+
         self.selected_square = []  # for user input
 
+    def draw_cell(self, row, col, value):
+        """Draw one cell on the board surface."""
+        color = (255, 255, 255) if value == 0 else (0, 255, 0)
+        pygame.draw.rect(
+            self.board, color,
+            pygame.Rect(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
+        )
+        # Draw the value if it's non-zero
+        if value > 0:
+            self.board.blit(self.digits[value], (col * self.cell_size + self.digit_offset[0],
+                                                 row * self.cell_size + self.digit_offset[1]))
+
     def draw_grid(self):
-        """Draw the game grid."""
-        for row in range(self.game.m):
-            for col in range(self.game.n):
-                value = self.game.grid[0][row][col]
-                color = (255, 255, 255) if value == 0 else (0, 255, 0)
-                pygame.draw.rect(
-                    self.screen, color,
-                    pygame.Rect(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
-                )
-                # Draw the value if it's non-zero
-                if value > 0:
-                    text = self.font.render(str(value), True, (0, 0, 0))
-                    self.screen.blit(text, (col * self.cell_size + 15, row * self.cell_size + 10))
+        """Redraw the cells changed since the last frame.
+
+        Returns:
+            list: Dirty screen rects (the bounding box of the changed cells)
+        """
+        grid = self.game.grid[0]
+        if self.prev_grid is None or self.prev_grid.shape != grid.shape:
+            changed = np.argwhere(np.ones(grid.shape, dtype=bool))
+        else:
+            changed = np.argwhere(grid != self.prev_grid)
+        if len(changed) == 0:
+            return []
+
+        for row, col in changed:
+            self.draw_cell(row, col, int(grid[row, col]))
+        self.prev_grid = grid.copy()
+
+        # 한 번의 step은 사각형 하나만 지우므로 바뀐 칸들의 bounding box만 화면에 옮김
+        (top, left), (bottom, right) = changed.min(axis=0), changed.max(axis=0) + 1
+        rect = pygame.Rect(left * self.cell_size, top * self.cell_size,
+                           (right - left) * self.cell_size, (bottom - top) * self.cell_size)
+        self.screen.blit(self.board, rect, rect)
+        return [rect]
 
     def draw_info(self):
-        """Draw additional information like score and remaining steps."""
-        score_text = self.font.render(f"Score: {self.game.get_score()}", True, (255, 255, 255))
-        steps_text = self.font.render(f"Steps Left: {self.game.max_steps - self.game.steps}", True, (255, 255, 255))
+        """Draw additional information like score and remaining steps, if they changed.
+
+        Returns:
+            list: Dirty screen rects
+        """
+        info = (self.game.get_score(), self.game.max_steps - self.game.steps)
+        if info == self.prev_info:
+            return []
+        self.prev_info = info
+
+        self.screen.fill((0, 0, 0), self.info_rect)
+        score_text = self.font.render(f"Score: {info[0]}", True, (255, 255, 255))
+        steps_text = self.font.render(f"Steps Left: {info[1]}", True, (255, 255, 255))
         self.screen.blit(score_text, (10, self.height + 10))
         self.screen.blit(steps_text, (200, self.height + 10))
+        return [self.info_rect]
 
     def render(self):
-        """Render the game state."""
-        self.screen.fill((0, 0, 0))  # Clear screen
-        self.draw_grid()  # Draw grid
-        self.draw_info()  # Draw score and steps
-        pygame.display.flip()  # Update the display
+        """Render the game state, updating only the dirty regions of the display."""
+        first_frame = self.prev_grid is None
+        rects = self.draw_grid() + self.draw_info()
+        if first_frame:
+            pygame.display.flip()  # Update the whole display
+        elif rects:
+            pygame.display.update(rects)
 
     def handle_events(self):
         """Handle user input events."""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
+            elif event.type == pygame.MOUSEBUTTONDOWN and self.interactive:
                 # Handle user clicking to select a square
                 x, y = event.pos
                 row = y // self.cell_size
@@ -0,0 +1,130 @@
+import argparse
+import os
+import time
+import numpy as np
+from AppleGameEnv import AppleGameEnv
+from AppleGameShmVecEnv import AppleGameShmVecEnv
+from AppleGameVecEnv import AppleGameVecEnv
+
+
+def bench_step(m, n, n_steps=20000, **env_kwargs):
+    """ AppleGameEnv.step의 초당 스텝 수 측정
+
+    Args:
+        m (int): 게임판의 행 수
+        n (int): 게임판의 열 수
+        n_steps (int, optional): 측정할 스텝 수
+        env_kwargs: AppleGameEnv에 전달할 추가 인자
+
+    Returns:
+        float: 초당 스텝 수
+    """
+    env = AppleGameEnv(m, n, max_steps=n_steps + 1, **env_kwargs)
+    env.reset(seed=0)
+
+    # 행동 샘플링 비용은 측정에서 제외
+    actions = np.random.default_rng(0).uniform(-1, 1, size=(n_steps, 4)).astype(np.float32)
+
+    start = time.perf_counter()
+    for action in actions:
+        env.step(action)
+    return n_steps / (time.perf_counter() - start)
+
+
+def bench_render(m, n, num_envs=16, n_frames=20, cell_size=16):
+    """ AppleGameVecEnv.render(rgb_array)의 초당 프레임 수 측정
+
+    Args:
+        m (int): 게임판의 행 수
+        n (int): 게임판의 열 수
+        num_envs (int, optional): 한 번에 그릴 게임판의 수
+        n_frames (int, optional): 측정할 render 호출 수
+        cell_size (int, optional): 칸 한 변의 픽셀 수
+
+    Returns:
+        float: 초당 프레임 (게임판 하나 = 프레임 하나)
+    """
+    env = AppleGameVecEnv(num_envs, m, n, render_mode="rgb_array", cell_size=cell_size)
+    env.reset(seed=0)
+
+    start = time.perf_counter()
+    for _ in range(n_frames):
+        env.render()
+    return n_frames * num_envs / (time.perf_counter() - start)
+
+
+def bench_vec_step(env, n_steps=200):
+    """ vector 환경의 초당 스텝 수 측정 (게임판 하나의 스텝 = 스텝 하나)
+
+    Args:
+        env (gym.vector.VectorEnv): AppleGameVecEnv 또는 AppleGameShmVecEnv
+        n_steps (int, optional): 측정할 env.step 호출 수
+
+    Returns:
+        float: 초당 스텝 수
+    """
+    env.reset(seed=0)
+    actions = np.random.default_rng(0).uniform(-1, 1, size=(n_steps, env.num_envs, 4)).astype(np.float32)
+
+    start = time.perf_counter()
+    for action in actions:
+        env.step(action)
+    return n_steps * env.num_envs / (time.perf_counter() - start)
+
+
+def bench_shm(m, n, num_envs=64, n_steps=200, max_workers=None):
+    """ AppleGameShmVecEnv의 worker 수별 초당 스텝 수를 AppleGameVecEnv(단일 프로세스)와 비교
+
+    Args:
+        m (int): 게임판의 행 수
+        n (int): 게임판의 열 수
+        num_envs (int, optional): 동시에 진행할 게임판의 수
+        n_steps (int, optional): 측정할 env.step 호출 수
+        max_workers (int, optional): 측정할 최대 worker 수 (기본값: CPU 수), 1, 2, 4, ...와 max_workers를 측정
+
+    Returns:
+        dict: 이름 -> 초당 스텝 수 ("vec", "shm-1", "shm-2", ...)
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    workers = sorted({2 ** i for i in range(max_workers.bit_length()) if 2 ** i <= max_workers} | {max_workers})
+
+    env = AppleGameVecEnv(num_envs, m, n, max_steps=n_steps + 1)
+    results = {"vec": bench_vec_step(env, n_steps)}
+    env.close()
+    for num_workers in workers:
+        env = AppleGameShmVecEnv(num_envs, m, n, max_steps=n_steps + 1, num_workers=num_workers)
+        try:
+            results[f"shm-{num_workers}"] = bench_vec_step(env, n_steps)
+        finally:
+            env.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure AppleGameEnv.step throughput.")
+    parser.add_argument("--steps", type=int, default=20000, help="Number of steps per measurement.")
+    parser.add_argument("--shm-envs", type=int, default=64, help="Number of boards of the vector env benchmark.")
+    parser.add_argument("--shm-workers", type=int, default=None,
+                        help="Maximum number of AppleGameShmVecEnv workers (default: CPU count, 0 to skip).")
+    args = parser.parse_args()
+
+    configs = {
+        "default": {},
+        "reuse_info": {"reuse_info": True},
+    }
+    for m, n in [(10, 10), (36, 36)]:
+        for name, kwargs in configs.items():
+            sps = bench_step(m, n, args.steps, **kwargs)
+            print(f"{m:>3}x{n:<3} {name:<12} {sps:>12,.0f} steps/s")
+        print(f"{m:>3}x{n:<3} {'rgb_array':<12} {bench_render(m, n):>12,.0f} frames/s")
+
+        if args.shm_workers != 0:
+            # 같은 수의 게임판을 worker 수만 바꿔 진행, 단일 프로세스 AppleGameVecEnv 대비 배율을 함께 출력
+            results = bench_shm(m, n, args.shm_envs, max_workers=args.shm_workers)
+            for name, sps in results.items():
+                print(f"{m:>3}x{n:<3} {name:<12} {sps:>12,.0f} steps/s ({sps / results['vec']:.2f}x vec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,56 +1,149 @@
 import argparse
+import time
+import numpy as np
 import pygame
 from UI import UI
 from AppleGame import AppleGame
-from AppleGameEnv import AppleGameEnv
+from AppleGameVecEnv import AppleGameVecEnv
 from stable_baselines3 import PPO  # Assuming PPO is the algorithm used for training
 
 
-def main():
-    # Parse command-line arguments to choose game mode
-    parser = argparse.ArgumentParser(description="Play the Apple Game with or without a trained agent.")
-    parser.add_argument("--agent", type=str, default=None,
-                        help="Path to the trained agent model file (.zip). If not specified, play manually.")
-    args = parser.parse_args()
+class VecGameView:
+    """Expose one board of an AppleGameVecEnv with the AppleGame attributes used by UI."""
 
-    # Initialize UI
-    game = AppleGame()
-    ui = UI(game)
+    def __init__(self, env, index=0):
+        self.env = env
+        self.index = index
+        self.m = env.m
+        self.n = env.n
+        self.max_steps = env.max_steps
 
-    # If agent path is provided, load the agent
-    agent = None
-    with_agent = False
-    if args.agent:
-        print(f"Loading trained agent from {args.agent}...")
-        agent = PPO.load(args.agent)
-        env = AppleGameEnv()
-        with_agent = True
-    else:
-        print("No agent specified. Playing manually.")
+    @property
+    def grid(self):
+        return self.env.game.grid[self.index]
+
+    @property
+    def steps(self):
+        return int(self.env.game.steps[self.index])
+
+    def get_score(self):
+        return int(self.env.game.score[self.index])
+
+
+def evaluate(agent, num_games=100, num_envs=16, m=36, n=36, max_steps=1000, seed=0,
+             deterministic=False, show=False, render_fps=30):
+    """
+    Play seeded games with one batched predict call per step of all boards.
+
+    Board i of the vector env plays num_games // num_envs games (+1 for the first
+    num_games % num_envs boards), so the result only depends on the seed and num_envs.
+
+    Args:
+        agent: Model with a stable-baselines3 style predict(obs, deterministic)
+        num_games (int): Number of games to play
+        num_envs (int): Number of boards played at once
+        m (int): Number of rows
+        n (int): Number of columns
+        max_steps (int): Maximum number of steps per game
+        seed (int): Seed of the boards
+        deterministic (bool): Use deterministic actions
+        show (bool): Display board 0 while evaluating
+        render_fps (int): Maximum display refresh rate, independent of the simulation
+
+    Returns:
+        tuple: (scores (num_games,), elapsed seconds)
+    """
+    env = AppleGameVecEnv(num_envs, m, n, max_steps)
+    obs, _ = env.reset(seed=seed)
+
+    quotas = np.full(num_envs, num_games // num_envs)
+    quotas[:num_games % num_envs] += 1
+    scores = [[] for _ in range(num_envs)]
+    finished = np.zeros(num_envs, dtype=np.int64)
+
+    # Shrink the cells so large boards fit on screen, and ignore mouse input while evaluating
+    cell_size = max(8, min(50, 720 // max(m, n)))
+    ui = UI(VecGameView(env), cell_size=cell_size, interactive=False) if show else None
+    last_render = 0.0
+
+    start = time.perf_counter()
+    while (finished < quotas).any():
+        actions, _ = agent.predict(obs, deterministic=deterministic)
+        obs, _, terminated, truncated, info = env.step(actions)
 
-    # Main game loop
+        for i in np.flatnonzero(terminated | truncated):
+            if finished[i] < quotas[i]:
+                scores[i].append(int(info["final_info"][i]["score"]))
+                finished[i] += 1
+
+        # Redraw at most render_fps times per second, the simulation never waits for it
+        if ui is not None and time.perf_counter() - last_render >= 1 / render_fps:
+            last_render = time.perf_counter()
+            ui.render()
+            if not ui.handle_events():
+                pygame.display.quit()
+                ui = None
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return np.array([score for env_scores in scores for score in env_scores]), elapsed
+
+
+def play_manually():
+    """Play one game with the mouse."""
+    game = AppleGame()
+    ui = UI(game)
     game.reset()  # Initialize the game
+    clock = pygame.time.Clock()
     running = True
 
     while running:
         ui.render()  # Render the game
         running = ui.handle_events()
 
-        if with_agent:
-            # Handle agent play
-            obs = env.get_obs()  # Get the current observation
-            action, _ = agent.predict(obs, deterministic=True)  # Get action from the agent
-            game.step(action)  # Execute the agent's action
-
         # Check if the game is over
         if game.is_game_over():
             print(f"Game Over! Final Score: {game.get_score()}")
             running = False
 
         # Limit the frame rate
-        pygame.time.delay(100)
+        clock.tick(30)
+
+
+def main():
+    # Parse command-line arguments to choose game mode
+    parser = argparse.ArgumentParser(description="Play the Apple Game manually or evaluate a trained agent.")
+    parser.add_argument("--agent", type=str, default=None,
+                        help="Path to the trained agent model file (.zip). If not specified, play manually.")
+    parser.add_argument("--games", type=int, default=100, help="Number of evaluation games.")
+    parser.add_argument("--envs", type=int, default=16, help="Number of games played at once.")
+    parser.add_argument("--size", type=int, nargs=2, default=[36, 36], metavar=("M", "N"), help="Board size.")
+    parser.add_argument("--max-steps", type=int, default=1000, help="Maximum number of steps per game.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the evaluation boards.")
+    parser.add_argument("--deterministic", action="store_true", help="Use deterministic actions.")
+    parser.add_argument("--show", action="store_true", help="Display one of the games while evaluating.")
+    parser.add_argument("--fps", type=int, default=30, help="Maximum display refresh rate.")
+    args = parser.parse_args()
+
+    if not args.agent:
+        print("No agent specified. Playing manually.")
+        play_manually()
+        pygame.quit()  # Clean up the game
+        return
+
+    # Load the agent once for all games
+    print(f"Loading trained agent from {args.agent}...")
+    agent = PPO.load(args.agent)
+
+    m, n = args.size
+    scores, elapsed = evaluate(agent, args.games, args.envs, m, n, args.max_steps, args.seed,
+                               args.deterministic, args.show, args.fps)
+    pygame.quit()
 
-    pygame.quit()  # Clean up the game
+    print(f"{len(scores)} games in {elapsed:.2f}s ({len(scores) / elapsed:.2f} games/s)")
+    print(f"Score: mean {scores.mean():.2f} std {scores.std():.2f} "
+          f"min {scores.min()} median {np.median(scores):.1f} max {scores.max()}")
+    print("Percentiles (10/25/75/90): " + " / ".join(f"{p:.1f}" for p in np.percentile(scores, [10, 25, 75, 90])))
 
 
 if __name__ == "__main__":
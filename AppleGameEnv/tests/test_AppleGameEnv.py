@@ -0,0 +1,79 @@
+import os
+import sys
+
+import numpy as np
+from gymnasium.wrappers import RecordEpisodeStatistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from AppleGameEnv import AppleGameEnv  # noqa: E402
+
+
+def run_episodes(env, n_episodes, seed=0):
+    """ 무작위 행동으로 n_episodes번의 에피소드를 진행하고 각 스텝의 info를 복사하여 반환
+    """
+    rng = np.random.default_rng(seed)
+    episodes = []
+    for episode in range(n_episodes):
+        _, info = env.reset(seed=seed + episode)
+        infos = [dict(info)]
+        done = False
+        while not done:
+            _, _, terminated, truncated, info = env.step(rng.uniform(-1, 1, 4))
+            infos.append(dict(info))
+            done = terminated or truncated
+        episodes.append(infos)
+    return episodes
+
+
+def test_reuse_info_under_record_episode_statistics():
+    env = RecordEpisodeStatistics(AppleGameEnv(5, 5, max_steps=10, reuse_info=True, action_mask=True))
+    episodes = run_episodes(env, 3)
+
+    for infos in episodes:
+        # "episode"는 마지막 스텝에만 있어야 함
+        assert ["episode" in info for info in infos] == [False] * (len(infos) - 1) + [True]
+        assert infos[-1]["episode"]["l"] == len(infos) - 1
+
+
+def test_reuse_info_matches_fresh_info():
+    kwargs = dict(m=5, n=5, max_steps=10, action_mask=True)
+    reused = run_episodes(AppleGameEnv(reuse_info=True, **kwargs), 2)
+    fresh = run_episodes(AppleGameEnv(**kwargs), 2)
+
+    for reused_infos, fresh_infos in zip(reused, fresh):
+        for reused_info, fresh_info in zip(reused_infos, fresh_infos):
+            assert reused_info.keys() == fresh_info.keys()
+            assert reused_info["score"] == fresh_info["score"]
+            assert reused_info["steps"] == fresh_info["steps"]
+
+
+def test_terminate_when_stuck_defaults():
+    assert AppleGameEnv(5, 5, action_mode="discrete").terminate_when_stuck
+    assert not AppleGameEnv(5, 5).terminate_when_stuck
+    # info의 마스크만 요청해도 continuous 모드의 에피소드 길이는 바뀌지 않음
+    assert not AppleGameEnv(5, 5, action_mask=True).terminate_when_stuck
+    assert AppleGameEnv(5, 5, action_mask=True, terminate_when_stuck=True).terminate_when_stuck
+
+
+def test_discrete_episode_ends_when_stuck():
+    env = AppleGameEnv(10, 10, max_steps=1000, action_mode="discrete")
+    rng = np.random.default_rng(0)
+    env.reset(seed=0)
+    terminated = truncated = False
+    while not (terminated or truncated):
+        _, _, terminated, truncated, _ = env.step(rng.choice(np.flatnonzero(env.action_masks())))
+    assert terminated and not truncated
+    assert env.game.steps < 1000
+    assert not env.action_masks().any() or env.game.is_game_over()
+
+
+def test_vec_env_builds_tiles_only_when_rendering():
+    from AppleGameVecEnv import AppleGameVecEnv
+
+    # 그리지 않는다면 글자가 들어가지 않는 칸 크기로도 생성할 수 있어야 함
+    AppleGameVecEnv(2, 5, 5, cell_size=1).close()
+
+    env = AppleGameVecEnv(2, 5, 5, render_mode="rgb_array", cell_size=10)
+    env.reset(seed=0)
+    assert env.render().shape == (2, 50, 50, 3)
+    env.close()